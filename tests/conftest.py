@@ -3,11 +3,13 @@ Test configuration for VeriDoc test suite.
 """
 
 import pytest
-import tempfile
+import pytest_asyncio
+import httpx
 import os
-import shutil
 from pathlib import Path
-from typing import Generator, List, Dict
+from types import MappingProxyType
+from typing import AsyncGenerator, Generator, List, Dict, Mapping
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from veridoc.server import app
@@ -16,19 +18,9 @@ from veridoc.core.security import SecurityManager
 from veridoc.core.file_handler import FileHandler
 
 
-@pytest.fixture(scope="session")
-def test_data_dir() -> Generator[Path, None, None]:
-    """Create a temporary directory with test data."""
-    temp_dir = Path(tempfile.mkdtemp())
-    
-    # Create test directory structure
-    (temp_dir / "docs").mkdir()
-    (temp_dir / "docs" / "subdirectory").mkdir()
-    (temp_dir / "src").mkdir()
-    
-    # Create test files
-    test_files = {
-        "README.md": """# Test Project
+# Files written into test_data_dir, keyed by path relative to it
+TEST_FILES = MappingProxyType({
+    "README.md": """# Test Project
         
 This is a test project for VeriDoc testing.
 
@@ -41,7 +33,7 @@ This is a test project for VeriDoc testing.
 python main.py
 ```
 """,
-        "docs/api.md": """# API Documentation
+    "docs/api.md": """# API Documentation
 
 ## Endpoints
 
@@ -51,7 +43,7 @@ Returns health status.
 ### GET /api/files
 Returns file listing.
 """,
-        "docs/guide.md": """# User Guide
+    "docs/guide.md": """# User Guide
 
 This is a comprehensive user guide.
 
@@ -66,11 +58,11 @@ For advanced users, consider these options:
 - Environment variables
 - CLI arguments
 """,
-        "docs/subdirectory/nested.md": """# Nested Document
+    "docs/subdirectory/nested.md": """# Nested Document
 
 This is a nested document for testing directory traversal.
 """,
-        "src/main.py": """#!/usr/bin/env python3
+    "src/main.py": """#!/usr/bin/env python3
 \"\"\"
 Main application entry point.
 \"\"\"
@@ -81,39 +73,102 @@ def main():
 if __name__ == "__main__":
     main()
 """,
-        "config.json": """{
+    "config.json": """{
     "name": "test-project",
     "version": "1.0.0",
     "description": "Test project for VeriDoc"
 }""",
-        "large_file.txt": "Line {}\n" * 2000,  # Create a large file for pagination testing
-    }
+})
+
+
+@pytest.fixture(scope="session")
+def test_data_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a temporary directory with test data, once per session.
+    
+    Tests must treat it as read-only; tests that create files use tmp_path.
+    """
+    temp_dir = tmp_path_factory.mktemp("veridoc")
+    
+    # Create test directory structure
+    (temp_dir / "docs").mkdir()
+    (temp_dir / "docs" / "subdirectory").mkdir()
+    (temp_dir / "src").mkdir()
     
     # Write test files
-    for file_path, content in test_files.items():
+    for file_path, content in TEST_FILES.items():
         full_path = temp_dir / file_path
         full_path.parent.mkdir(parents=True, exist_ok=True)
-        if file_path == "large_file.txt":
-            with open(full_path, "w") as f:
-                for i in range(2000):
-                    f.write(f"Line {i+1}\n")
-        else:
-            full_path.write_text(content)
-    
-    yield temp_dir
+        full_path.write_text(content)
     
-    # Cleanup
-    shutil.rmtree(temp_dir)
+    return temp_dir
 
 
-@pytest.fixture
-def test_client(test_data_dir: Path, monkeypatch) -> TestClient:
-    """Create a test client with test data directory."""
+@pytest.fixture(scope="session")
+def fixture_contents(test_data_dir: Path) -> Mapping[str, str]:
+    """Expected content of each file in test_data_dir, without reading it back."""
+    return TEST_FILES
+
+
+@pytest.fixture(scope="session")
+def large_file(test_data_dir: Path) -> Path:
+    """Create the 2000-line file used for pagination tests, once per session."""
+    file_path = test_data_dir / "large_file.txt"
+    file_path.write_bytes(b"".join(b"Line %d\n" % i for i in range(1, 2001)))
+    return file_path
+
+
+@pytest.fixture(scope="session")
+def test_app(
+    test_data_dir: Path,
+    security_manager: SecurityManager,
+    file_handler: FileHandler
+) -> Generator[FastAPI, None, None]:
+    """Create the simplified test app once per session."""
     # Override base path for testing using environment variable
-    monkeypatch.setenv("VERIDOC_BASE_PATH", str(test_data_dir))
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("VERIDOC_BASE_PATH", str(test_data_dir))
+        yield _build_test_app(test_data_dir, security_manager, file_handler)
+
+
+@pytest.fixture(scope="session")
+def test_client(test_app: FastAPI) -> Generator[TestClient, None, None]:
+    """Create a test client with test data directory, built once per session."""
+    # Create TestClient - handle compatibility issues with httpx 0.28.1 vs FastAPI 0.104.1
+    try:
+        client = TestClient(test_app)
+    except TypeError as e:
+        if "unexpected keyword argument 'app'" in str(e):
+            pytest.skip("TestClient compatibility issue: httpx 0.28.1 vs FastAPI 0.104.1 - dependency version conflict")
+        else:
+            raise
     
+    # Enter once so the lifespan and transport are shared by every test
+    with client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def git_available(test_client: TestClient) -> bool:
+    """Probe the git status endpoint once for the whole session."""
+    return test_client.get("/api/git/status").status_code == 200
+
+
+@pytest_asyncio.fixture
+async def async_client(test_app: FastAPI) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """Create an async client that drives the test app in-process."""
+    transport = httpx.ASGITransport(app=test_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+def _build_test_app(
+    test_data_dir: Path,
+    security_manager: SecurityManager,
+    file_handler: FileHandler
+) -> FastAPI:
+    """Build the simplified FastAPI app used by the API tests."""
     # Create a simplified FastAPI app for testing without complex lifespan
-    from fastapi import FastAPI, HTTPException
+    from fastapi import HTTPException
     from fastapi.responses import JSONResponse
     from veridoc.core.enhanced_error_handling import handle_async_api_error
     
@@ -121,14 +176,10 @@ def test_client(test_data_dir: Path, monkeypatch) -> TestClient:
     
     # Initialize components for testing
     from veridoc.core.config import Config
-    from veridoc.core.security import SecurityManager
-    from veridoc.core.file_handler import FileHandler
     from veridoc.core.search_optimization import OptimizedSearchEngine
     
     config = Config()
     config.BASE_PATH = str(test_data_dir)
-    security_manager = SecurityManager(str(test_data_dir))
-    file_handler = FileHandler(security_manager)
     search_engine = OptimizedSearchEngine(str(test_data_dir))
     
     # Store in app state
@@ -153,9 +204,7 @@ def test_client(test_data_dir: Path, monkeypatch) -> TestClient:
     async def get_files(path: str = ""):
         # Use SecurityManager for path validation like the real server
         try:
-            # Create a temporary SecurityManager for testing with the test directory
-            temp_security = SecurityManager(test_data_dir)
-            safe_path = temp_security.validate_path(path)
+            safe_path = security_manager.validate_path(path)
         except ValueError as e:
             if "Path traversal" in str(e) or "outside base directory" in str(e):
                 raise HTTPException(status_code=403, detail="Access denied")
@@ -190,9 +239,7 @@ def test_client(test_data_dir: Path, monkeypatch) -> TestClient:
     async def get_file_content(path: str, page: int = 1, lines_per_page: int = 1000):
         # Use SecurityManager for path validation like the real server
         try:
-            # Create a temporary SecurityManager for testing with the test directory
-            temp_security = SecurityManager(test_data_dir)
-            safe_path = temp_security.validate_path(path)
+            safe_path = security_manager.validate_path(path)
         except ValueError as e:
             if "Path traversal" in str(e) or "outside base directory" in str(e):
                 raise HTTPException(status_code=403, detail="Access denied")
@@ -229,28 +276,28 @@ def test_client(test_data_dir: Path, monkeypatch) -> TestClient:
         results = await search_engine.search(q, search_type=type, limit=limit)
         return results  # Return results directly to match test expectations
     
-    # Create TestClient - handle compatibility issues with httpx 0.28.1 vs FastAPI 0.104.1
-    try:
-        return TestClient(test_app)
-    except TypeError as e:
-        if "unexpected keyword argument 'app'" in str(e):
-            pytest.skip("TestClient compatibility issue: httpx 0.28.1 vs FastAPI 0.104.1 - dependency version conflict")
-        else:
-            raise
+    return test_app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def security_manager(test_data_dir: Path) -> SecurityManager:
-    """Create a SecurityManager instance for testing."""
-    return SecurityManager(str(test_data_dir))
+    """Create a SecurityManager instance shared by the session's tests."""
+    return SecurityManager.get(str(test_data_dir))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def file_handler(security_manager: SecurityManager) -> FileHandler:
-    """Create a FileHandler instance for testing."""
+    """Create a FileHandler instance shared by the session's tests."""
     return FileHandler(security_manager)
 
 
+@pytest.fixture(autouse=True)
+def _reset_file_handler_caches(request: pytest.FixtureRequest):
+    """Start each test that uses the shared FileHandler with empty caches."""
+    if "file_handler" in request.fixturenames:
+        request.getfixturevalue("file_handler").invalidate()
+
+
 @pytest.fixture
 def malicious_paths() -> List[str]:
     """Common malicious path patterns for security testing."""
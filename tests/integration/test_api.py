@@ -2,9 +2,34 @@
 Integration tests for API endpoints.
 """
 
+import math
+from typing import Any, Mapping
+
+import httpx
+import orjson
 import pytest
-import json
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
+from starlette.middleware.cors import CORSMiddleware
+
+from veridoc.server import app
+
+# Default lines_per_page of /api/file_content and the size of large_file.txt
+PAGE_SIZE = 1000
+LARGE_FILE_LINES = 2000
+LAST_PAGE = math.ceil(LARGE_FILE_LINES / PAGE_SIZE)
+
+# Keys each response object must carry, checked with one subset test
+HEALTH_FIELDS = frozenset({"status", "uptime_seconds", "memory_usage_mb"})
+FILE_ENTRY_FIELDS = frozenset({"name", "type", "size", "modified"})
+SEARCH_RESULT_FIELDS = frozenset({"file", "score", "matches"})
+GIT_STATUS_FIELDS = frozenset({"branch", "clean", "modified", "untracked", "added", "deleted"})
+GIT_LOG_ENTRY_FIELDS = frozenset({"hash", "author", "date", "message"})
+
+
+def _json(response: httpx.Response) -> Any:
+    """Decode a response body with orjson."""
+    return orjson.loads(response.content)
 
 
 class TestHealthEndpoint:
@@ -15,7 +40,9 @@ class TestHealthEndpoint:
         response = test_client.get("/api/health")
         assert response.status_code == 200
         
-        data = response.json()
+        assert response.headers["content-type"] == "application/json"
+        
+        data = _json(response)
         assert data["status"] == "healthy"
         assert "uptime_seconds" in data
         assert "memory_usage_mb" in data
@@ -23,12 +50,10 @@ class TestHealthEndpoint:
     def test_health_endpoint_structure(self, test_client: TestClient):
         """Test health endpoint response structure."""
         response = test_client.get("/api/health")
-        data = response.json()
+        data = _json(response)
         
         # Check required fields
-        required_fields = ["status", "uptime_seconds", "memory_usage_mb"]
-        for field in required_fields:
-            assert field in data
+        assert HEALTH_FIELDS <= data.keys()
         
         # Check data types
         assert isinstance(data["status"], str)
@@ -44,7 +69,7 @@ class TestFilesEndpoint:
         response = test_client.get("/api/files")
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         assert isinstance(data, list)
         assert len(data) > 0
         
@@ -55,10 +80,10 @@ class TestFilesEndpoint:
 
     def test_files_endpoint_with_path(self, test_client: TestClient):
         """Test files endpoint with specific path."""
-        response = test_client.get("/api/files?path=docs")
+        response = test_client.get("/api/files", params={"path": "docs"})
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         assert isinstance(data, list)
         
         file_names = [f["name"] for f in data]
@@ -68,108 +93,90 @@ class TestFilesEndpoint:
     def test_files_endpoint_file_structure(self, test_client: TestClient):
         """Test files endpoint response structure."""
         response = test_client.get("/api/files")
-        data = response.json()
+        data = _json(response)
         
         # Check structure of each file entry
         for file_entry in data:
-            assert "name" in file_entry
-            assert "type" in file_entry
-            assert "size" in file_entry
-            assert "modified" in file_entry
+            assert FILE_ENTRY_FIELDS <= file_entry.keys()
             assert file_entry["type"] in ["file", "directory"]
             assert isinstance(file_entry["size"], int)
             assert isinstance(file_entry["modified"], str)
 
     def test_files_endpoint_nonexistent_path(self, test_client: TestClient):
         """Test files endpoint with non-existent path."""
-        response = test_client.get("/api/files?path=nonexistent")
+        response = test_client.get("/api/files", params={"path": "nonexistent"})
         assert response.status_code == 404
 
     def test_files_endpoint_malicious_path(self, test_client: TestClient):
         """Test files endpoint with malicious path."""
-        response = test_client.get("/api/files?path=../../../etc")
+        response = test_client.get("/api/files", params={"path": "../../../etc"})
         assert response.status_code == 403  # Forbidden due to security validation
 
 
 class TestFileContentEndpoint:
     """Test cases for file content endpoint."""
 
-    def test_file_content_markdown(self, test_client: TestClient):
+    def test_file_content_markdown(self, test_client: TestClient, fixture_contents: Mapping[str, str]):
         """Test file content endpoint with markdown file."""
-        response = test_client.get("/api/file_content?path=README.md")
+        response = test_client.get("/api/file_content", params={"path": "README.md"})
         assert response.status_code == 200
         
-        data = response.json()
-        assert "content" in data
+        data = _json(response)
         assert "metadata" in data
-        assert "# Test Project" in data["content"]
+        assert data["content"] == fixture_contents["README.md"]
 
     def test_file_content_python(self, test_client: TestClient):
         """Test file content endpoint with Python file."""
-        response = test_client.get("/api/file_content?path=src/main.py")
+        response = test_client.get("/api/file_content", params={"path": "src/main.py"})
         assert response.status_code == 200
         
-        data = response.json()
-        assert "content" in data
-        assert "def main():" in data["content"]
+        # A substring check doesn't need the body decoded
+        assert b"def main():" in response.content
 
     def test_file_content_json(self, test_client: TestClient):
         """Test file content endpoint with JSON file."""
-        response = test_client.get("/api/file_content?path=config.json")
+        response = test_client.get("/api/file_content", params={"path": "config.json"})
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         assert "content" in data
         
         # Should be valid JSON content
-        json_content = json.loads(data["content"])
+        json_content = orjson.loads(data["content"])
         assert json_content["name"] == "test-project"
 
     def test_file_content_nonexistent(self, test_client: TestClient):
         """Test file content endpoint with non-existent file."""
-        response = test_client.get("/api/file_content?path=nonexistent.md")
+        response = test_client.get("/api/file_content", params={"path": "nonexistent.md"})
         assert response.status_code == 404
 
     def test_file_content_malicious_path(self, test_client: TestClient):
         """Test file content endpoint with malicious path."""
-        response = test_client.get("/api/file_content?path=../../../etc/passwd")
+        response = test_client.get("/api/file_content", params={"path": "../../../etc/passwd"})
         assert response.status_code == 403
 
     def test_file_content_directory(self, test_client: TestClient):
         """Test file content endpoint with directory."""
-        response = test_client.get("/api/file_content?path=docs")
+        response = test_client.get("/api/file_content", params={"path": "docs"})
         assert response.status_code == 400  # Bad request - cannot read directory as file
 
-    def test_file_content_pagination(self, test_client: TestClient):
+    @pytest.mark.usefixtures("large_file")
+    @pytest.mark.parametrize("page,expected_status", [
+        (1, 200),
+        (LAST_PAGE, 200),
+        (999, 400),  # Bad request - invalid page
+    ])
+    def test_file_content_pagination(self, test_client: TestClient, page: int, expected_status: int):
         """Test file content endpoint with pagination."""
-        response = test_client.get("/api/file_content?path=large_file.txt&page=1")
-        assert response.status_code == 200
+        response = test_client.get("/api/file_content", params={"path": "large_file.txt", "page": page})
+        assert response.status_code == expected_status
         
-        data = response.json()
-        assert "content" in data
-        assert "pagination" in data
-        assert data["pagination"]["page"] == 1
-        assert data["pagination"]["total_pages"] > 1
-        assert data["pagination"]["total_lines"] == 2000
-
-    def test_file_content_pagination_last_page(self, test_client: TestClient):
-        """Test file content endpoint with last page."""
-        # Get first page to know total pages
-        response = test_client.get("/api/file_content?path=large_file.txt&page=1")
-        data = response.json()
-        total_pages = data["pagination"]["total_pages"]
-        
-        # Get last page
-        response = test_client.get(f"/api/file_content?path=large_file.txt&page={total_pages}")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert data["pagination"]["page"] == total_pages
-
-    def test_file_content_pagination_invalid_page(self, test_client: TestClient):
-        """Test file content endpoint with invalid page number."""
-        response = test_client.get("/api/file_content?path=large_file.txt&page=999")
-        assert response.status_code == 400  # Bad request - invalid page
+        if expected_status == 200:
+            data = _json(response)
+            assert "content" in data
+            assert data["pagination"]["page"] == page
+            assert data["pagination"]["total_pages"] == LAST_PAGE
+            assert data["pagination"]["total_lines"] == LARGE_FILE_LINES
 
     def test_file_content_missing_path(self, test_client: TestClient):
         """Test file content endpoint without path parameter."""
@@ -182,26 +189,24 @@ class TestSearchEndpoint:
 
     def test_search_content(self, test_client: TestClient):
         """Test search endpoint for content search."""
-        response = test_client.get("/api/search?q=VeriDoc&type=content")
+        response = test_client.get("/api/search", params={"q": "VeriDoc", "type": "content"})
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         assert isinstance(data, list)
         
         # Check result structure
         if len(data) > 0:
             result = data[0]
-            assert "file" in result
-            assert "score" in result
-            assert "matches" in result
+            assert SEARCH_RESULT_FIELDS <= result.keys()
             assert isinstance(result["matches"], list)
 
     def test_search_filename(self, test_client: TestClient):
         """Test search endpoint for filename search."""
-        response = test_client.get("/api/search?q=api&type=filename")
+        response = test_client.get("/api/search", params={"q": "api", "type": "filename"})
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         assert isinstance(data, list)
         
         # Should find api.md
@@ -211,42 +216,42 @@ class TestSearchEndpoint:
 
     def test_search_both(self, test_client: TestClient):
         """Test search endpoint for both content and filename."""
-        response = test_client.get("/api/search?q=test&type=both")
+        response = test_client.get("/api/search", params={"q": "test", "type": "both"})
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         assert isinstance(data, list)
 
     def test_search_with_limit(self, test_client: TestClient):
         """Test search endpoint with limit parameter."""
-        response = test_client.get("/api/search?q=test&type=both&limit=2")
+        response = test_client.get("/api/search", params={"q": "test", "type": "both", "limit": 2})
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         assert isinstance(data, list)
         assert len(data) <= 2
 
     def test_search_no_results(self, test_client: TestClient):
         """Test search endpoint with no results."""
-        response = test_client.get("/api/search?q=nonexistentterm12345&type=both")
+        response = test_client.get("/api/search", params={"q": "nonexistentterm12345", "type": "both"})
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         assert isinstance(data, list)
         assert len(data) == 0
 
     def test_search_empty_query(self, test_client: TestClient):
         """Test search endpoint with empty query."""
-        response = test_client.get("/api/search?q=&type=both")
+        response = test_client.get("/api/search", params={"q": "", "type": "both"})
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         assert isinstance(data, list)
         assert len(data) == 0
 
     def test_search_invalid_type(self, test_client: TestClient):
         """Test search endpoint with invalid search type."""
-        response = test_client.get("/api/search?q=test&type=invalid")
+        response = test_client.get("/api/search", params={"q": "test", "type": "invalid"})
         assert response.status_code == 422  # Unprocessable Entity - invalid enum value
 
     def test_search_missing_parameters(self, test_client: TestClient):
@@ -258,104 +263,88 @@ class TestSearchEndpoint:
 class TestGitEndpoints:
     """Test cases for Git-related endpoints."""
 
+    @pytest.fixture(autouse=True)
+    def _require_git(self, git_available: bool):
+        """Skip the class when the test app isn't serving a git repository."""
+        if not git_available:
+            pytest.skip("Git endpoints unavailable - not a git repository")
+
     def test_git_status_endpoint(self, test_client: TestClient):
         """Test git status endpoint."""
         response = test_client.get("/api/git/status")
-        assert response.status_code in [200, 404]  # 404 if not a git repository
+        assert response.status_code == 200
         
-        if response.status_code == 200:
-            data = response.json()
-            assert "branch" in data
-            assert "clean" in data
-            assert "modified" in data
-            assert "untracked" in data
-            assert "added" in data
-            assert "deleted" in data
+        data = _json(response)
+        assert GIT_STATUS_FIELDS <= data.keys()
 
     def test_git_log_endpoint(self, test_client: TestClient):
         """Test git log endpoint."""
         response = test_client.get("/api/git/log")
-        assert response.status_code in [200, 404]  # 404 if not a git repository
+        assert response.status_code == 200
+        
+        data = _json(response)
+        assert isinstance(data, list)
         
-        if response.status_code == 200:
-            data = response.json()
-            assert isinstance(data, list)
-            
-            # Check structure of log entries
-            for entry in data:
-                assert "hash" in entry
-                assert "author" in entry
-                assert "date" in entry
-                assert "message" in entry
+        # Check structure of log entries
+        for entry in data:
+            assert GIT_LOG_ENTRY_FIELDS <= entry.keys()
 
     def test_git_log_with_limit(self, test_client: TestClient):
         """Test git log endpoint with limit parameter."""
-        response = test_client.get("/api/git/log?limit=5")
-        assert response.status_code in [200, 404]
+        response = test_client.get("/api/git/log", params={"limit": 5})
+        assert response.status_code == 200
         
-        if response.status_code == 200:
-            data = response.json()
-            assert isinstance(data, list)
-            assert len(data) <= 5
+        data = _json(response)
+        assert isinstance(data, list)
+        assert len(data) <= 5
 
     def test_git_diff_endpoint(self, test_client: TestClient):
         """Test git diff endpoint."""
         response = test_client.get("/api/git/diff")
-        assert response.status_code in [200, 404]  # 404 if not a git repository
+        assert response.status_code == 200
         
-        if response.status_code == 200:
-            data = response.json()
-            assert "diff" in data
-            assert isinstance(data["diff"], str)
+        data = _json(response)
+        assert "diff" in data
+        assert isinstance(data["diff"], str)
 
     def test_git_diff_specific_file(self, test_client: TestClient):
         """Test git diff endpoint for specific file."""
-        response = test_client.get("/api/git/diff?file_path=README.md")
-        assert response.status_code in [200, 404]
+        response = test_client.get("/api/git/diff", params={"file_path": "README.md"})
+        assert response.status_code == 200
         
-        if response.status_code == 200:
-            data = response.json()
-            assert "diff" in data
+        data = _json(response)
+        assert "diff" in data
 
 
 class TestErrorHandling:
     """Test cases for error handling."""
 
-    def test_404_for_invalid_endpoint(self, test_client: TestClient):
-        """Test 404 response for invalid endpoint."""
-        response = test_client.get("/api/nonexistent")
-        assert response.status_code == 404
-
-    def test_method_not_allowed(self, test_client: TestClient):
-        """Test 405 response for wrong HTTP method."""
-        response = test_client.post("/api/health")
-        assert response.status_code == 405
+    def test_router_shape(self, test_app: FastAPI):
+        """Test unknown endpoints and wrong methods have no route (404/405)."""
+        # Checked on the routing table rather than through requests
+        routes = {
+            getattr(route, "path", None): frozenset(getattr(route, "methods", None) or ())
+            for route in test_app.routes
+        }
+        
+        assert "/api/nonexistent" not in routes
+        assert routes["/api/health"] == frozenset({"GET"})  # No POST
 
     def test_large_request(self, test_client: TestClient):
         """Test handling of large requests."""
         # This would test request size limits if implemented
         large_query = "x" * 10000
-        response = test_client.get(f"/api/search?q={large_query}&type=content")
         
-        # Should handle gracefully (either process or reject)
-        assert response.status_code in [200, 413, 422]  # 413 = Request Entity Too Large
-
-    def test_cors_headers(self, test_client: TestClient):
-        """Test CORS headers in responses."""
-        response = test_client.get("/api/health")
-        
-        # Check for CORS headers if configured
-        # This depends on whether CORS is enabled in the application
-        headers = response.headers
-        # Basic check - just ensure we get a valid response
-        assert response.status_code == 200
+        # Stream so only the status is read, never the body
+        with test_client.stream("GET", "/api/search", params={"q": large_query, "type": "content"}) as response:
+            # Should handle gracefully (either process or reject)
+            assert response.status_code in [200, 413, 422]  # 413 = Request Entity Too Large
 
-    def test_content_type_headers(self, test_client: TestClient):
-        """Test content type headers in responses."""
-        response = test_client.get("/api/health")
-        
-        assert response.headers["content-type"] == "application/json"
-        assert response.status_code == 200
+    def test_cors_not_enabled(self):
+        """Test the app doesn't allow cross-origin requests."""
+        # The frontend is served from the same origin, so no CORS middleware
+        # should be installed; checked on the app without a request
+        assert not any(m.cls is CORSMiddleware for m in app.user_middleware)
 
     def test_response_encoding(self, test_client: TestClient):
         """Test response encoding for non-ASCII content."""
@@ -364,5 +353,5 @@ class TestErrorHandling:
         assert response.status_code == 200
         
         # Ensure response is properly encoded
-        data = response.json()
+        data = _json(response)
         assert isinstance(data, list)
\ No newline at end of file
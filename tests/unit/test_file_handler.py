@@ -5,10 +5,15 @@ Unit tests for FileHandler.
 import pytest
 import json
 from pathlib import Path
+from typing import Mapping
 from unittest.mock import patch, MagicMock
 
-from veridoc.core.file_handler import FileHandler
+from veridoc.core.file_handler import FileHandler, guess_mime_type
 from veridoc.core.security import SecurityManager
+from veridoc.models.api_models import FileContentResponse, FileItem
+
+# First default-sized page of the large_file fixture ("Line 1" to "Line 2000")
+LARGE_FILE_FIRST_PAGE = "".join(f"Line {i}\n" for i in range(1, 1001))
 
 
 class TestFileHandler:
@@ -20,7 +25,6 @@ class TestFileHandler:
         assert file_handler.security == security_manager
         assert hasattr(file_handler, 'markdown_extensions')
 
-    @pytest.mark.asyncio
     async def test_list_files_root_directory(self, file_handler: FileHandler, test_data_dir: Path):
         """Test listing files in root directory."""
         # Use Path object for root directory
@@ -36,15 +40,35 @@ class TestFileHandler:
         assert "docs" in file_names
         assert "src" in file_names
         
-        # Check FileItem structure
-        for file_entry in files:
-            assert hasattr(file_entry, 'name')
-            assert hasattr(file_entry, 'type')
-            assert hasattr(file_entry, 'size')
-            assert hasattr(file_entry, 'modified')
-            assert file_entry.type in ["file", "directory"]
+        # FileItem's schema guarantees the fields, so check the type once
+        assert all(isinstance(file_entry, FileItem) for file_entry in files)
+        assert {file_entry.type for file_entry in files} <= {"file", "directory"}
+
+    async def test_list_files_cached(self, tmp_path: Path):
+        """Test listings are reused until the directory is invalidated."""
+        file_handler = FileHandler(SecurityManager(tmp_path), listing_cache_ttl=60)
+        (tmp_path / "a.md").write_text("a")
+        
+        first = await file_handler.list_directory(tmp_path)
+        second = await file_handler.list_directory(tmp_path)
+        assert second is not first
+        assert [id(item) for item in second] == [id(item) for item in first]
+        
+        new_file = tmp_path / "b.md"
+        new_file.write_text("b")
+        file_handler.invalidate(new_file)
+        names = [item.name for item in await file_handler.list_directory(tmp_path)]
+        assert names == ["a.md", "b.md"]
+
+    async def test_list_files_large_directory(self, tmp_path: Path):
+        """Test directories spanning several stat batches are listed completely."""
+        file_handler = FileHandler(SecurityManager(tmp_path))
+        for i in range(600):
+            (tmp_path / f"file{i:03d}.md").write_text("x")
+
+        files = await file_handler.list_directory(tmp_path)
+        assert [f.name for f in files] == [f"file{i:03d}.md" for i in range(600)]
 
-    @pytest.mark.asyncio
     async def test_list_files_subdirectory(self, file_handler: FileHandler, test_data_dir: Path):
         """Test listing files in subdirectory."""
         docs_path = test_data_dir / "docs"
@@ -58,25 +82,23 @@ class TestFileHandler:
         assert "guide.md" in file_names
         assert "subdirectory" in file_names
 
-    @pytest.mark.asyncio
-    async def test_list_files_empty_directory(self, file_handler: FileHandler, test_data_dir: Path):
+    async def test_list_files_empty_directory(self, tmp_path: Path):
         """Test listing files in empty directory."""
-        # Create empty directory
-        empty_dir = test_data_dir / "empty"
+        # Create the empty directory outside the shared session tree
+        file_handler = FileHandler(SecurityManager(tmp_path))
+        empty_dir = tmp_path / "empty"
         empty_dir.mkdir()
         
         files = await file_handler.list_directory(empty_dir)
         assert isinstance(files, list)
         assert len(files) == 0
 
-    @pytest.mark.asyncio
     async def test_list_files_nonexistent_directory(self, file_handler: FileHandler, test_data_dir: Path):
         """Test listing files in non-existent directory."""
         nonexistent_path = test_data_dir / "nonexistent"
         with pytest.raises(ValueError):  # Changed to ValueError as it checks is_dir()
             await file_handler.list_directory(nonexistent_path)
 
-    @pytest.mark.asyncio
     async def test_list_files_malicious_path(self, file_handler: FileHandler):
         """Test listing files with malicious path."""
         malicious_path = Path("../../../etc")
@@ -84,47 +106,43 @@ class TestFileHandler:
         with pytest.raises(ValueError, match="Path traversal not allowed"):
             await file_handler.list_directory(malicious_path)
 
-    @pytest.mark.asyncio
-    async def test_read_file_markdown(self, file_handler: FileHandler, test_data_dir: Path):
+    async def test_read_file_markdown(
+        self, file_handler: FileHandler, test_data_dir: Path, fixture_contents: Mapping[str, str]
+    ):
         """Test reading markdown file."""
         file_path = test_data_dir / "README.md"
         content_response = await file_handler.get_file_content(file_path)
         
-        assert hasattr(content_response, 'content')
-        assert "# Test Project" in content_response.content
-        assert "Features" in content_response.content
-        assert "Usage" in content_response.content
+        assert content_response.content == fixture_contents["README.md"]
 
-    @pytest.mark.asyncio
-    async def test_read_file_python(self, file_handler: FileHandler, test_data_dir: Path):
+    async def test_read_file_python(
+        self, file_handler: FileHandler, test_data_dir: Path, fixture_contents: Mapping[str, str]
+    ):
         """Test reading Python file."""
         file_path = test_data_dir / "src" / "main.py"
         content_response = await file_handler.get_file_content(file_path)
         
-        assert hasattr(content_response, 'content')
-        assert "def main():" in content_response.content
-        assert 'print("Hello, VeriDoc!")' in content_response.content
+        assert content_response.content == fixture_contents["src/main.py"]
 
-    @pytest.mark.asyncio
-    async def test_read_file_json(self, file_handler: FileHandler, test_data_dir: Path):
+    async def test_read_file_json(
+        self, file_handler: FileHandler, test_data_dir: Path, fixture_contents: Mapping[str, str]
+    ):
         """Test reading JSON file."""
         file_path = test_data_dir / "config.json"
         content_response = await file_handler.get_file_content(file_path)
         
-        assert hasattr(content_response, 'content')
+        assert content_response.content == fixture_contents["config.json"]
         # Should be valid JSON
         json_data = json.loads(content_response.content)
         assert json_data["name"] == "test-project"
         assert json_data["version"] == "1.0.0"
 
-    @pytest.mark.asyncio
     async def test_read_file_nonexistent(self, file_handler: FileHandler, test_data_dir: Path):
         """Test reading non-existent file."""
         file_path = test_data_dir / "nonexistent.md"
         with pytest.raises(FileNotFoundError):
             await file_handler.get_file_content(file_path)
 
-    @pytest.mark.asyncio
     async def test_read_file_malicious_path(self, file_handler: FileHandler):
         """Test reading file with malicious path."""
         malicious_path = Path("../../../etc/passwd")
@@ -132,25 +150,19 @@ class TestFileHandler:
         with pytest.raises(ValueError, match="Path traversal not allowed"):
             await file_handler.get_file_content(malicious_path)
 
-    @pytest.mark.asyncio
     async def test_read_file_directory(self, file_handler: FileHandler, test_data_dir: Path):
         """Test reading directory as file."""
         dir_path = test_data_dir / "docs"
         with pytest.raises((IsADirectoryError, ValueError)):
             await file_handler.get_file_content(dir_path)
 
-    @pytest.mark.asyncio
-    async def test_read_file_large_file(self, file_handler: FileHandler, test_data_dir: Path):
+    async def test_read_file_large_file(self, file_handler: FileHandler, large_file: Path):
         """Test reading large file with pagination."""
-        file_path = test_data_dir / "large_file.txt"
-        content_response = await file_handler.get_file_content(file_path)
+        content_response = await file_handler.get_file_content(large_file)
         
-        assert hasattr(content_response, 'content')
-        lines = content_response.content.strip().split('\n')
+        assert isinstance(content_response, FileContentResponse)
         # Should return 1000 lines per page (default pagination)
-        assert len(lines) == 1000
-        assert lines[0] == "Line 1"
-        assert lines[-1] == "Line 1000"
+        assert content_response.content == LARGE_FILE_FIRST_PAGE
         
         # Test pagination metadata
         assert content_response.pagination.total_lines == 2000
@@ -159,7 +171,19 @@ class TestFileHandler:
         assert content_response.pagination.has_next == True
         assert content_response.pagination.has_previous == False
 
-    @pytest.mark.asyncio
+    async def test_read_file_pages_match_readlines(self, tmp_path: Path):
+        """Test paginated content matches slicing readlines()."""
+        file_handler = FileHandler(SecurityManager(tmp_path))
+        file_path = tmp_path / "lines.txt"
+        # Long enough to span several skip chunks, with no trailing newline
+        file_path.write_text("\n".join(f"line {i}" for i in range(5000)) + "\n\nlast")
+        lines = file_path.read_text().splitlines(keepends=True)
+        
+        for page in (1, 2, 3, 2501):
+            response = await file_handler.get_file_content(file_path, page=page, lines_per_page=2)
+            assert response.content == "".join(lines[(page - 1) * 2:page * 2])
+            assert response.pagination.total_lines == len(lines) == 5002
+
     async def test_get_file_info_file(self, file_handler: FileHandler, test_data_dir: Path):
         """Test getting file info for a file."""
         file_path = test_data_dir / "README.md"
@@ -172,7 +196,6 @@ class TestFileHandler:
         assert info["size"] > 0
         assert "modified" in info
 
-    @pytest.mark.asyncio
     async def test_get_file_info_directory(self, file_handler: FileHandler, test_data_dir: Path):
         """Test getting file info for a directory."""
         dir_path = test_data_dir / "docs"
@@ -185,14 +208,26 @@ class TestFileHandler:
         assert info["size"] >= 0
         assert "modified" in info
 
-    @pytest.mark.asyncio
+    async def test_get_file_info_cached(self, tmp_path: Path):
+        """Test file info is reused until the file changes."""
+        file_handler = FileHandler(SecurityManager(tmp_path))
+        file_path = tmp_path / "notes.md"
+        file_path.write_text("one\ntwo\n")
+        
+        first = await file_handler.get_file_metadata(file_path)
+        assert first["line_count"] == 2
+        assert await file_handler.get_file_metadata(file_path) == first
+        
+        file_path.write_text("one\ntwo\nthree\n")
+        file_handler.invalidate(file_path)
+        assert (await file_handler.get_file_metadata(file_path))["line_count"] == 3
+
     async def test_get_file_info_nonexistent(self, file_handler: FileHandler, test_data_dir: Path):
         """Test getting file info for non-existent file."""
         file_path = test_data_dir / "nonexistent.md"
         with pytest.raises(FileNotFoundError):
             await file_handler.get_file_metadata(file_path)
 
-    @pytest.mark.asyncio
     async def test_get_file_info_malicious_path(self, file_handler: FileHandler):
         """Test getting file info with malicious path."""
         malicious_path = Path("../../../etc/passwd")
@@ -203,15 +238,29 @@ class TestFileHandler:
     # Search functionality moved to OptimizedSearchEngine in Phase 4
     # These tests are now handled in test_search_optimization.py
 
-    def test_is_text_file_markdown(self, file_handler: FileHandler, test_data_dir: Path):
-        """Test _is_text_file with markdown file."""
-        file_path = test_data_dir / "README.md"
-        assert file_handler._is_text_file(file_path) is True
+    @pytest.mark.parametrize("name,expected", [
+        ("README.md", True),
+        ("main.py", True),
+        ("config.json", True),
+        ("app.log", True),
+        ("image.png", False),
+        ("document.pdf", False),
+        ("archive.zip", False),
+        ("program.exe", False),
+    ])
+    def test_is_text_file(self, file_handler: FileHandler, name: str, expected: bool):
+        """Test _is_text_file classification by extension."""
+        assert file_handler._is_text_file(Path(name)) is expected
 
-    def test_is_text_file_python(self, file_handler: FileHandler, test_data_dir: Path):
-        """Test _is_text_file with Python file."""
-        file_path = test_data_dir / "src" / "main.py"
-        assert file_handler._is_text_file(file_path) is True
+    @pytest.mark.parametrize("name,expected", [
+        (".gitignore", True),  # Dot files are configuration files
+        (".env", True),
+        ("README", False),
+        ("Makefile", False),
+    ])
+    def test_is_text_file_no_extension(self, file_handler: FileHandler, name: str, expected: bool):
+        """Test _is_text_file for names without an extension."""
+        assert file_handler._is_text_file(Path(name)) is expected
 
     def test_get_file_category_markdown(self, file_handler: FileHandler, test_data_dir: Path):
         """Test get_file_category with markdown file."""
@@ -228,6 +277,12 @@ class TestFileHandler:
         assert Path("README").suffix == ""
         assert Path("file.backup.md").suffix == ".md"
 
+    def test_guess_mime_type(self):
+        """Test MIME type lookup by suffix."""
+        assert guess_mime_type(Path("logo.PNG")) == "image/png"
+        assert guess_mime_type(Path("data.json")) == "application/json"
+        assert guess_mime_type(Path("README")) is None
+
     # File size validation is now handled in SecurityManager
 
     # Pagination is now handled at the API level, not in FileHandler
\ No newline at end of file
@@ -4,12 +4,42 @@ Unit tests for Git integration functionality.
 
 import pytest
 import subprocess
-from unittest.mock import patch, MagicMock, call
+from collections import deque
+from unittest.mock import patch, MagicMock
 from pathlib import Path
+from typing import List, Optional
 
 from veridoc.core.git_integration import GitIntegration
 
 
+class FakeRun:
+    """Stand-in for subprocess.run that replays queued results in order."""
+
+    def __init__(self):
+        self.calls: List[List[str]] = []
+        self._results: deque = deque()
+
+    def enqueue(self, returncode: int = 0, stdout: str = "", raises: Optional[BaseException] = None):
+        """Queue the outcome of the next call: a completed process, or an exception."""
+        self._results.append(raises or subprocess.CompletedProcess([], returncode, stdout, ""))
+
+    def __call__(self, args: List[str], **kwargs) -> subprocess.CompletedProcess:
+        self.calls.append(args)
+        assert self._results, f"unexpected subprocess.run call: {args}"
+        result = self._results.popleft()
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+
+@pytest.fixture
+def mock_run(monkeypatch: pytest.MonkeyPatch) -> FakeRun:
+    """Replace subprocess.run with a FakeRun for the duration of a test."""
+    fake_run = FakeRun()
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    return fake_run
+
+
 class TestGitIntegration:
     """Test cases for GitIntegration class."""
 
@@ -50,18 +80,14 @@ class TestGitIntegration:
             git_integration._is_git_repo = None  # Reset cache
             assert git_integration.is_git_repository is False
 
-    @patch('subprocess.run')
-    def test_get_git_status(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_git_status(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting git status."""
         # Create .git directory to simulate git repository
         git_dir = test_data_dir / ".git"
         git_dir.mkdir(exist_ok=True)
         
         # Mock git status output
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="## main\n M modified.txt\n?? untracked.txt\n A  added.txt\n"
-        )
+        mock_run.enqueue(returncode=0, stdout="## main\n M modified.txt\n?? untracked.txt\n A  added.txt\n")
         
         git_integration = GitIntegration(str(test_data_dir))
         status = git_integration.get_git_status()
@@ -82,14 +108,10 @@ class TestGitIntegration:
         assert len(status["added"]) == 1
         assert "added.txt" in status["added"]
 
-    @patch('subprocess.run')
-    def test_get_git_status_clean(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_git_status_clean(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting git status for clean repository."""
         # Mock clean git status
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout=""
-        )
+        mock_run.enqueue(returncode=0, stdout="")
         
         git_integration = GitIntegration(str(test_data_dir))
         status = git_integration.get_git_status()
@@ -100,19 +122,17 @@ class TestGitIntegration:
         assert len(status["added"]) == 0
         assert len(status["deleted"]) == 0
 
-    @patch('subprocess.run')
-    def test_get_git_status_not_git_repo(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_git_status_not_git_repo(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting git status when not a git repository."""
         # Mock git command failure
-        mock_run.return_value = MagicMock(returncode=128)
+        mock_run.enqueue(returncode=128)
         
         git_integration = GitIntegration(str(test_data_dir))
         status = git_integration.get_git_status()
         
         assert status is None
 
-    @patch('subprocess.run')
-    def test_get_git_log(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_git_log(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting git log."""
         # Create .git directory to simulate git repository
         git_dir = test_data_dir / ".git"
@@ -122,10 +142,7 @@ class TestGitIntegration:
         mock_log_output = """abc123|Test User <test@example.com>|2024-01-01 12:00:00 +0000|Initial commit
 def456|Test User <test@example.com>|2024-01-01 11:00:00 +0000|Second commit"""
         
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout=mock_log_output
-        )
+        mock_run.enqueue(returncode=0, stdout=mock_log_output)
         
         git_integration = GitIntegration(str(test_data_dir))
         log = git_integration.get_git_log(limit=10)
@@ -143,14 +160,10 @@ def456|Test User <test@example.com>|2024-01-01 11:00:00 +0000|Second commit"""
         assert log[1]["hash"] == "def456"
         assert log[1]["message"] == "Second commit"
 
-    @patch('subprocess.run')
-    def test_get_git_log_empty(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_git_log_empty(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting git log for repository with no commits."""
         # Mock empty git log
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout=""
-        )
+        mock_run.enqueue(returncode=0, stdout="")
         
         git_integration = GitIntegration(str(test_data_dir))
         log = git_integration.get_git_log()
@@ -158,19 +171,17 @@ def456|Test User <test@example.com>|2024-01-01 11:00:00 +0000|Second commit"""
         assert isinstance(log, list)
         assert len(log) == 0
 
-    @patch('subprocess.run')
-    def test_get_git_log_not_git_repo(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_git_log_not_git_repo(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting git log when not a git repository."""
         # Mock git command failure
-        mock_run.return_value = MagicMock(returncode=128)
+        mock_run.enqueue(returncode=128)
         
         git_integration = GitIntegration(str(test_data_dir))
         log = git_integration.get_git_log()
         
         assert log is None
 
-    @patch('subprocess.run')
-    def test_get_git_diff(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_git_diff(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting git diff."""
         # Mock git diff output
         mock_diff_output = """diff --git a/file.txt b/file.txt
@@ -183,10 +194,7 @@ index 1234567..abcdefg 100644
 +line 2 modified
  line 3
 """
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout=mock_diff_output
-        )
+        mock_run.enqueue(returncode=0, stdout=mock_diff_output)
         
         git_integration = GitIntegration(str(test_data_dir))
         diff = git_integration.get_git_diff()
@@ -195,13 +203,9 @@ index 1234567..abcdefg 100644
         assert "diff --git" in diff
         assert "line 2 modified" in diff
 
-    @patch('subprocess.run')
-    def test_get_git_diff_specific_file(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_git_diff_specific_file(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting git diff for specific file."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="diff for specific file"
-        )
+        mock_run.enqueue(returncode=0, stdout="diff for specific file")
         
         git_integration = GitIntegration(str(test_data_dir))
         diff = git_integration.get_git_diff(file_path="README.md")
@@ -210,75 +214,59 @@ index 1234567..abcdefg 100644
         assert diff == "diff for specific file"
         
         # Verify git command included file path
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args[0][0]
-        assert "README.md" in call_args
+        assert len(mock_run.calls) == 1
+        assert "README.md" in mock_run.calls[0]
 
-    @patch('subprocess.run')
-    def test_get_git_diff_no_changes(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_git_diff_no_changes(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting git diff when no changes exist."""
         # Mock empty diff
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout=""
-        )
+        mock_run.enqueue(returncode=0, stdout="")
         
         git_integration = GitIntegration(str(test_data_dir))
         diff = git_integration.get_git_diff()
         
         assert diff == ""
 
-    @patch('subprocess.run')
-    def test_get_git_diff_not_git_repo(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_git_diff_not_git_repo(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting git diff when not a git repository."""
         # Mock git command failure
-        mock_run.return_value = MagicMock(returncode=128)
+        mock_run.enqueue(returncode=128)
         
         git_integration = GitIntegration(str(test_data_dir))
         diff = git_integration.get_git_diff()
         
         assert diff is None
 
-    @patch('subprocess.run')
-    def test_get_current_branch(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_current_branch(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting current branch."""
         # Mock git branch output
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="main\n"
-        )
+        mock_run.enqueue(returncode=0, stdout="main\n")
         
         git_integration = GitIntegration(str(test_data_dir))
         branch = git_integration.get_current_branch()
         
         assert branch == "main"
 
-    @patch('subprocess.run')
-    def test_get_current_branch_detached_head(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_current_branch_detached_head(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting current branch in detached HEAD state."""
         # Mock detached HEAD
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="* (HEAD detached at abc123)\n"
-        )
+        mock_run.enqueue(returncode=0, stdout="* (HEAD detached at abc123)\n")
         
         git_integration = GitIntegration(str(test_data_dir))
         branch = git_integration.get_current_branch()
         
         assert "detached" in branch.lower()
 
-    @patch('subprocess.run')
-    def test_get_current_branch_not_git_repo(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_get_current_branch_not_git_repo(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting current branch when not a git repository."""
         # Mock git command failure
-        mock_run.return_value = MagicMock(returncode=128)
+        mock_run.enqueue(returncode=128)
         
         git_integration = GitIntegration(str(test_data_dir))
         branch = git_integration.get_current_branch()
         
         assert branch is None
 
-    @pytest.mark.asyncio
     @patch('asyncio.create_subprocess_exec')
     async def test_get_file_history(self, mock_subprocess: MagicMock, test_data_dir: Path):
         """Test getting file history."""
@@ -311,15 +299,10 @@ def456|Test User|test@example.com|2024-01-01 11:00:00 +0000|Add README.md"""
         assert history[1]["hash"] == "def456"
         assert history[1]["message"] == "Add README.md"
 
-    @pytest.mark.asyncio
-    @patch('subprocess.run')
-    async def test_get_file_history_no_history(self, mock_run: MagicMock, test_data_dir: Path):
+    async def test_get_file_history_no_history(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting file history for file with no history."""
         # Mock empty git log
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout=""
-        )
+        mock_run.enqueue(returncode=0, stdout="")
         
         git_integration = GitIntegration(str(test_data_dir))
         history = await git_integration.get_file_history(Path("newfile.md"))
@@ -327,23 +310,20 @@ def456|Test User|test@example.com|2024-01-01 11:00:00 +0000|Add README.md"""
         assert isinstance(history, list)
         assert len(history) == 0
 
-    @pytest.mark.asyncio
-    @patch('subprocess.run')
-    async def test_get_file_history_not_git_repo(self, mock_run: MagicMock, test_data_dir: Path):
+    async def test_get_file_history_not_git_repo(self, mock_run: FakeRun, test_data_dir: Path):
         """Test getting file history when not a git repository."""
         # Mock git command failure
-        mock_run.return_value = MagicMock(returncode=128)
+        mock_run.enqueue(returncode=128)
         
         git_integration = GitIntegration(str(test_data_dir))
         history = await git_integration.get_file_history(Path("README.md"))
         
         assert history == []
 
-    @patch('subprocess.run')
-    def test_command_execution_timeout(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_command_execution_timeout(self, mock_run: FakeRun, test_data_dir: Path):
         """Test git command execution with timeout."""
         # Mock timeout exception
-        mock_run.side_effect = subprocess.TimeoutExpired('git', 10)
+        mock_run.enqueue(raises=subprocess.TimeoutExpired('git', 10))
         
         git_integration = GitIntegration(str(test_data_dir))
         result = git_integration.get_git_status()
@@ -351,11 +331,10 @@ def456|Test User|test@example.com|2024-01-01 11:00:00 +0000|Add README.md"""
         # Should handle timeout gracefully
         assert result is None
 
-    @patch('subprocess.run')
-    def test_command_execution_permission_error(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_command_execution_permission_error(self, mock_run: FakeRun, test_data_dir: Path):
         """Test git command execution with permission error."""
         # Mock permission error
-        mock_run.side_effect = PermissionError("Permission denied")
+        mock_run.enqueue(raises=PermissionError("Permission denied"))
         
         git_integration = GitIntegration(str(test_data_dir))
         result = git_integration.get_git_status()
@@ -363,14 +342,10 @@ def456|Test User|test@example.com|2024-01-01 11:00:00 +0000|Add README.md"""
         # Should handle permission error gracefully
         assert result is None
 
-    @patch('subprocess.run')
-    def test_parse_git_log_malformed(self, mock_run: MagicMock, test_data_dir: Path):
+    def test_parse_git_log_malformed(self, mock_run: FakeRun, test_data_dir: Path):
         """Test parsing malformed git log output."""
         # Mock malformed git log output
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="malformed output without proper format"
-        )
+        mock_run.enqueue(returncode=0, stdout="malformed output without proper format")
         
         git_integration = GitIntegration(str(test_data_dir))
         log = git_integration.get_git_log()
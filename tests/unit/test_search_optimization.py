@@ -0,0 +1,234 @@
+"""
+Unit tests for search optimization components.
+"""
+
+import pytest
+import asyncio
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from veridoc.core.search_optimization import FilenameIndex, SearchCache, SearchIndex, TrigramIndex
+
+
+class TestTrigramIndex:
+    """Test cases for TrigramIndex class."""
+
+    def test_extract_trigrams_case_insensitive(self):
+        """Test trigrams are extracted from ASCII-lowercased content."""
+        assert TrigramIndex.extract_trigrams(b"ABCD") == TrigramIndex.extract_trigrams(b"abcd")
+        assert len(TrigramIndex.extract_trigrams(b"abcd")) == 2
+        assert TrigramIndex.extract_trigrams(b"ab") == set()
+
+    def test_candidates_require_all_query_trigrams(self, tmp_path: Path):
+        """Test only files containing every query trigram are candidates."""
+        index = TrigramIndex(str(tmp_path))
+        index.update("a.md", 1, 10, b"VeriDoc documentation browser")
+        index.update("b.md", 1, 10, b"FastAPI web framework")
+
+        assert index.candidates(b"veridoc").paths == {"a.md"}
+        assert index.candidates(b"framework").paths == {"b.md"}
+        assert index.candidates(b"nothing here").paths == set()
+
+    def test_candidates_short_query(self, tmp_path: Path):
+        """Test queries shorter than a trigram cannot be filtered."""
+        index = TrigramIndex(str(tmp_path))
+        index.update("a.md", 1, 10, b"content")
+
+        assert index.candidates(b"co") is None
+
+    def test_candidates_snapshot(self, tmp_path: Path):
+        """Test candidates only report entries indexed before they were read as fresh."""
+        index = TrigramIndex(str(tmp_path))
+        index.update("a.md", 1, 10, b"VeriDoc documentation browser")
+        candidates = index.candidates(b"veridoc")
+
+        index.update("b.md", 1, 10, b"VeriDoc again")
+        assert candidates.paths == {"a.md"}
+        assert candidates.is_fresh("a.md", 1, 10)
+        assert not candidates.is_fresh("b.md", 1, 10)
+        assert index.is_fresh("b.md", 1, 10)
+
+    def test_update_replaces_postings(self, tmp_path: Path):
+        """Test re-indexing a file replaces its previous content."""
+        index = TrigramIndex(str(tmp_path))
+        index.update("a.md", 1, 10, b"old content")
+        index.update("a.md", 2, 12, b"new material")
+
+        assert index.candidates(b"old").paths == set()
+        assert index.candidates(b"material").paths == {"a.md"}
+        assert index.is_fresh("a.md", 2, 12)
+        assert not index.is_fresh("a.md", 1, 10)
+
+    def test_index_persists(self, tmp_path: Path):
+        """Test index entries survive reopening the database."""
+        index = TrigramIndex(str(tmp_path))
+        index.update("a.md", 5, 7, b"persistent")
+
+        reopened = TrigramIndex(str(tmp_path))
+        assert reopened.is_fresh("a.md", 5, 7)
+        assert reopened.candidates(b"persist").paths == {"a.md"}
+
+    def test_shared_between_instances(self, tmp_path: Path):
+        """Test instances opened on one database, like worker processes, index the same path."""
+        first = TrigramIndex(str(tmp_path))
+        second = TrigramIndex(str(tmp_path))
+        first.update("a.md", 1, 10, b"old content")
+        second.update("a.md", 2, 12, b"new material")
+
+        assert second.is_fresh("a.md", 2, 12)
+        assert first.candidates(b"material").paths == {"a.md"}
+        assert first.candidates(b"old").paths == set()
+        assert TrigramIndex(str(tmp_path)).is_fresh("a.md", 2, 12)
+
+    def test_racy_entries_not_fresh(self, tmp_path: Path):
+        """Test a same-size rewrite within the mtime tick of indexing is not trusted."""
+        index = TrigramIndex(str(tmp_path))
+        note = tmp_path / "note.md"
+        note.write_bytes(b"alpha")
+        stat = note.stat()
+        index.update("note.md", stat.st_mtime_ns, stat.st_size, note.read_bytes(), time.time_ns())
+
+        note.write_bytes(b"gamma")
+        os.utime(note, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert not index.is_fresh("note.md", stat.st_mtime_ns, stat.st_size)
+        assert not index.candidates(b"gamma").is_fresh("note.md", stat.st_mtime_ns, stat.st_size)
+
+        # Once the mtime is safely older than the read, the entry is trusted
+        old_ns = time.time_ns() - 3600 * 10**9
+        os.utime(note, ns=(old_ns, old_ns))
+        index.update("note.md", old_ns, stat.st_size, note.read_bytes(), time.time_ns())
+        assert index.is_fresh("note.md", old_ns, stat.st_size)
+        assert index.candidates(b"gamma").paths == {"note.md"}
+
+    def test_rows_without_read_time_not_fresh(self, tmp_path: Path):
+        """Test rows from databases predating read times are re-read, not trusted."""
+        (tmp_path / ".veridoc").mkdir()
+        conn = sqlite3.connect(str(tmp_path / ".veridoc" / "trigram_index.db"))
+        conn.execute(
+            "CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL,"
+            " mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL)"
+        )
+        conn.execute("INSERT INTO files (path, mtime_ns, size) VALUES ('a.md', 1, 10)")
+        conn.commit()
+        conn.close()
+
+        index = TrigramIndex(str(tmp_path))
+        assert not index.is_fresh("a.md", 1, 10)
+        index.update("a.md", 1, 10, b"content")
+        assert index.is_fresh("a.md", 1, 10)
+
+    def test_large_files_not_indexed(self, tmp_path: Path):
+        """Test files above the size limit are left out of the index."""
+        index = TrigramIndex(str(tmp_path), max_file_size=4)
+        index.update("big.md", 1, 100, b"too large to index")
+
+        assert not index.is_fresh("big.md", 1, 100)
+
+
+class TestFilenameIndex:
+    """Test cases for FilenameIndex class."""
+
+    def test_matches(self, tmp_path: Path):
+        """Test names are matched case-insensitively, skipping hidden and pruned directories."""
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "API.md").write_text("")
+        (tmp_path / "docs" / "guide.md").write_text("")
+        (tmp_path / ".hidden").mkdir()
+        (tmp_path / ".hidden" / "api.md").write_text("")
+        (tmp_path / "node_modules").mkdir()
+        (tmp_path / "node_modules" / "api.js").write_text("")
+        index = FilenameIndex(frozenset({"node_modules"}))
+
+        names = [match.name for match in index.matches(str(tmp_path), "api")]
+        assert names == ["API.md"]
+        assert len(index.matches(str(tmp_path), "api", include_hidden=True)) == 2
+        assert [match.name for match in index.matches(str(tmp_path), "g")] == ["guide.md"]
+
+    def test_changes_picked_up(self, tmp_path: Path):
+        """Test created and removed files and directories are reflected in matches."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "old.md").write_text("")
+        index = FilenameIndex()
+        assert len(index.matches(str(tmp_path), "old")) == 1
+
+        (docs / "old.md").rename(docs / "new.md")
+        assert index.matches(str(tmp_path), "old") == []
+        assert [match.path for match in index.matches(str(tmp_path), "new")] == [str(docs / "new.md")]
+
+        (docs / "new.md").unlink()
+        docs.rmdir()
+        assert index.matches(str(tmp_path), "new") == []
+        assert index.get_statistics()["indexed_directories"] == 1
+
+    def test_racy_mtime_rescanned(self, tmp_path: Path):
+        """Test a change that leaves a recent directory mtime unchanged is still found."""
+        index = FilenameIndex()
+        assert index.matches(str(tmp_path), "new") == []
+
+        # Same-tick creation: the directory mtime does not move
+        stat = tmp_path.stat()
+        (tmp_path / "new.md").write_text("")
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert [match.name for match in index.matches(str(tmp_path), "new")] == ["new.md"]
+
+    def test_aged_mtime_trusted(self, tmp_path: Path):
+        """Test directories whose mtime is well before the scan are not reread."""
+        old_ns = time.time_ns() - 3600 * 10**9
+        os.utime(tmp_path, ns=(old_ns, old_ns))
+        index = FilenameIndex()
+        assert index.matches(str(tmp_path), "new") == []
+
+        (tmp_path / "new.md").write_text("")
+        os.utime(tmp_path, ns=(old_ns, old_ns))
+        assert index.matches(str(tmp_path), "new") == []
+
+
+class TestSearchIndex:
+    """Test cases for SearchIndex class."""
+
+    async def test_prefix_matches(self, tmp_path: Path):
+        """Test query tokens match indexed tokens they prefix, including newly indexed files."""
+        (tmp_path / "a.md").write_text("configuration loader")
+        index = SearchIndex(str(tmp_path))
+        # The instance's index_file path attribute shadows the method
+        await SearchIndex.index_file(index, tmp_path / "a.md")
+
+        assert [result.file_path for result in index.search("config")] == ["a.md"]
+        assert index.search("zebra") == []
+
+        (tmp_path / "b.md").write_text("configure the zebra step")
+        await SearchIndex.index_file(index, tmp_path / "b.md")
+        assert [result.file_path for result in index.search("zebra")] == ["b.md"]
+        assert {result.file_path for result in index.search("config")} == {"a.md", "b.md"}
+
+
+    async def test_concurrent_saves(self, tmp_path: Path):
+        """Test overlapping saves, as from several workers, leave a loadable index."""
+        (tmp_path / "a.md").write_text("configuration loader")
+        first = SearchIndex(str(tmp_path))
+        second = SearchIndex(str(tmp_path))
+        await SearchIndex.index_file(first, tmp_path / "a.md")
+        await SearchIndex.index_file(second, tmp_path / "a.md")
+
+        await asyncio.gather(first.save_index(), second.save_index(), first.save_index())
+        assert list(SearchIndex(str(tmp_path)).index) == ["a.md"]
+        assert list((tmp_path / ".veridoc").glob("*.tmp")) == []
+
+
+class TestSearchCache:
+    """Test cases for SearchCache class."""
+
+    def test_evicts_least_recently_used(self):
+        """Test a cache hit protects an entry from the next eviction."""
+        cache = SearchCache(max_size=2)
+        cache.put("first", 10, [])
+        cache.put("second", 10, [])
+        assert cache.get("first", 10) == []
+
+        cache.put("third", 10, [])
+        assert cache.get("second", 10) is None
+        assert cache.get("first", 10) == []
+        assert cache.get("third", 10) == []
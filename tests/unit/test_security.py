@@ -20,6 +20,20 @@ class TestSecurityManager:
         security_manager = SecurityManager(str(test_data_dir))
         assert security_manager.base_path == test_data_dir
 
+    def test_get_shared_instance(self, test_data_dir: Path):
+        """Test SecurityManager.get returns one instance per base path."""
+        first = SecurityManager.get(str(test_data_dir))
+        assert SecurityManager.get(str(test_data_dir)) is first
+        assert SecurityManager.get(test_data_dir) is first
+        assert SecurityManager.get(str(test_data_dir) + "/.") is first
+        assert SecurityManager.get(test_data_dir / "docs" / "..") is first
+        assert first.base_path == test_data_dir.resolve()
+
+    def test_base_prefix(self, test_data_dir: Path):
+        """Test base_prefix ends in exactly one separator, including for the root."""
+        assert SecurityManager(test_data_dir).base_prefix == str(test_data_dir.resolve()) + "/"
+        assert SecurityManager("/").base_prefix == "/"
+
     def test_validate_path_valid_paths(self, security_manager: SecurityManager, test_data_dir: Path):
         """Test validate_path with valid paths."""
         # Test valid paths within base directory
@@ -96,6 +110,103 @@ class TestSecurityManager:
                 # Skip if symlinks not supported
                 pytest.skip("Symbolic links not supported on this system")
 
+    def test_validate_path_symlink_outside_base(self, tmp_path: Path):
+        """Test symbolic links to files outside the base path are rejected."""
+        base = tmp_path / "base"
+        base.mkdir()
+        outside_file = tmp_path / "secret.txt"
+        outside_file.write_text("secret")
+
+        try:
+            (base / "absolute.txt").symlink_to(outside_file)
+            (base / "relative.txt").symlink_to(Path("..") / "secret.txt")
+        except OSError:
+            pytest.skip("Symbolic links not supported on this system")
+
+        security = SecurityManager(base)
+        for path in ["absolute.txt", "relative.txt"]:
+            with pytest.raises(ValueError):
+                security.validate_path(path)
+
+    def test_validate_path_symlinked_directory_outside_base(self, tmp_path: Path):
+        """Test symlinked directories cannot lead outside the base path."""
+        base = tmp_path / "base"
+        outside = tmp_path / "outside"
+        base.mkdir()
+        outside.mkdir()
+        (outside / "secret.txt").write_text("secret")
+
+        try:
+            (base / "link").symlink_to(outside, target_is_directory=True)
+        except OSError:
+            pytest.skip("Symbolic links not supported on this system")
+
+        security = SecurityManager(base)
+        with pytest.raises(ValueError):
+            security.validate_path("link/secret.txt")
+
+    def test_validate_path_cached(self, tmp_path: Path):
+        """Test repeated validations are served from the path cache."""
+        (tmp_path / "file.txt").write_text("content")
+        security = SecurityManager(tmp_path, path_cache_ttl=60)
+
+        first = security.validate_path("file.txt")
+        assert security.validate_path("file.txt") is first
+
+        security.clear_path_cache()
+        assert security.validate_path("file.txt") is not first
+
+    def test_invalidate_path(self, tmp_path: Path):
+        """Test invalidating one path leaves other cached paths alone."""
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "b.txt").write_text("b")
+        security = SecurityManager(tmp_path, path_cache_ttl=60)
+
+        first_a = security.validate_path("a.txt")
+        first_b = security.validate_path("b.txt")
+        with pytest.raises(ValueError):
+            security.validate_path("../outside.txt")
+
+        security.invalidate_path("a.txt")
+        security.invalidate_path("../outside.txt")
+        assert security.validate_path("a.txt") is not first_a
+        assert security.validate_path("b.txt") is first_b
+        assert len(security._reject_cache) == 0
+
+    def test_validate_path_rejections_cached(self, tmp_path: Path):
+        """Test rejected paths are remembered with their error message."""
+        security = SecurityManager(tmp_path, path_cache_ttl=60)
+
+        messages = []
+        for _ in range(2):
+            with pytest.raises(ValueError) as exc_info:
+                security.validate_path("../outside.txt")
+            messages.append(str(exc_info.value))
+
+        assert messages[0] == messages[1] == "Path traversal not allowed"
+        assert len(security._path_cache) == 0
+        assert len(security._reject_cache) == 1
+
+    def test_validate_path_rejection_expires(self, tmp_path: Path):
+        """Test a rejected path is revalidated once its entry expires."""
+        security = SecurityManager(tmp_path, path_cache_ttl=0)
+        outside = tmp_path.parent / (tmp_path.name + "-outside.txt")
+        outside.write_text("outside")
+        link = tmp_path / "link.txt"
+        try:
+            link.symlink_to(outside)
+        except OSError:
+            pytest.skip("Symbolic links not supported on this system")
+
+        with pytest.raises(ValueError):
+            security.validate_path("link.txt")
+
+        # Retargeting the link inside the base makes the path valid
+        (tmp_path / "inside.txt").write_text("inside")
+        link.unlink()
+        link.symlink_to(tmp_path / "inside.txt")
+        assert security.validate_path("link.txt") == (tmp_path / "inside.txt").resolve()
+
     def test_validate_path_empty_string(self, security_manager: SecurityManager):
         """Test validate_path with empty string."""
         # Empty string should resolve to base path
@@ -223,6 +334,22 @@ class TestSecurityManager:
         # Should not raise any security errors
         assert isinstance(result, Path)
 
+    def test_relative_path(self, security_manager: SecurityManager, test_data_dir: Path):
+        """Test relative_path matches Path.relative_to."""
+        file_path = security_manager.validate_path("docs/api.md")
+        assert security_manager.relative_path(file_path) == str(file_path.relative_to(test_data_dir))
+        assert security_manager.relative_path(security_manager.base_path) == "."
+
+        with pytest.raises(ValueError):
+            security_manager.relative_path(Path(str(test_data_dir) + "-sibling") / "file.md")
+
+    def test_is_safe_filename(self, security_manager: SecurityManager):
+        """Test is_safe_filename rejects dangerous characters and reserved names."""
+        assert security_manager.is_safe_filename("README.md")
+        for filename in ["a<b.md", "a>b", "c:d", 'q"uote', "p|ipe", "what?", "star*", "nul\x00l"]:
+            assert not security_manager.is_safe_filename(filename), filename
+        assert not security_manager.is_safe_filename("con")
+
     def test_validate_file_size_small_file(self, security_manager: SecurityManager):
         """Test validate_file_size with small file."""
         # Small file should be valid
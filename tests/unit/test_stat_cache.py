@@ -0,0 +1,70 @@
+"""
+Unit tests for StatCache.
+"""
+
+import os
+import pytest
+from pathlib import Path
+
+from veridoc.core.stat_cache import StatCache
+
+
+class TestStatCache:
+    """Test cases for StatCache class."""
+
+    def test_stat_matches_os_stat(self, test_data_dir: Path):
+        """Test cached stat matches os.stat."""
+        cache = StatCache()
+        file_path = test_data_dir / "README.md"
+
+        assert cache.stat(file_path).st_size == os.stat(file_path).st_size
+
+    def test_stat_served_from_cache(self, tmp_path: Path):
+        """Test repeated stats within the TTL reuse the first result."""
+        cache = StatCache(ttl=60)
+        file_path = tmp_path / "file.txt"
+        file_path.write_text("short")
+
+        first = cache.stat(file_path)
+        file_path.write_text("much longer content")
+
+        assert cache.stat(file_path) is first
+        cache.invalidate(file_path)
+        assert cache.stat(file_path).st_size == len("much longer content")
+
+    def test_stat_expires(self, tmp_path: Path):
+        """Test entries are refreshed once the TTL has passed."""
+        cache = StatCache(ttl=0)
+        file_path = tmp_path / "file.txt"
+        file_path.write_text("short")
+
+        first = cache.stat(file_path)
+        assert cache.stat(file_path) is not first
+
+    def test_stat_missing_file(self, tmp_path: Path):
+        """Test missing files raise FileNotFoundError."""
+        cache = StatCache()
+        with pytest.raises(FileNotFoundError):
+            cache.stat(tmp_path / "missing.txt")
+
+    def test_missing_file_cached(self, tmp_path: Path):
+        """Test a missing path keeps raising from cache within the TTL."""
+        cache = StatCache(ttl=60)
+        file_path = tmp_path / "late.txt"
+        with pytest.raises(FileNotFoundError):
+            cache.stat(file_path)
+
+        file_path.write_text("created")
+        with pytest.raises(FileNotFoundError):
+            cache.stat(file_path)
+        cache.invalidate(file_path)
+        assert cache.stat(file_path).st_size == len("created")
+
+    def test_max_entries(self, tmp_path: Path):
+        """Test the cache evicts least recently used entries."""
+        cache = StatCache(max_entries=2)
+        for name in ("a", "b", "c"):
+            (tmp_path / name).write_text(name)
+            cache.stat(tmp_path / name)
+
+        assert cache.get_statistics()["cache_size"] == 2
@@ -4,41 +4,165 @@ File system operations with security validation
 """
 
 import os
+import time
 import mimetypes
+from stat import S_ISDIR, S_ISREG
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
-import aiofiles
 import asyncio
 
 from .security import SecurityManager
+from .stat_cache import StatCache
 from ..models.api_models import FileItem, FileContentResponse, FileMetadata, PaginationInfo
 
+# Load the system MIME tables now rather than on the first request
+mimetypes.init()
+
+# File type categories for rendering priority
+_MARKDOWN_EXTENSIONS = frozenset({".md", ".markdown", ".mdown", ".mkd"})
+_DIAGRAM_EXTENSIONS = frozenset({".mmd", ".mermaid"})
+_TEXT_EXTENSIONS = frozenset({".txt", ".text", ".log"})
+_CODE_EXTENSIONS = frozenset({
+    # Top 10 languages (Phase 3 priority)
+    ".py", ".js", ".java", ".ts", ".c", ".cpp", ".cs", ".php", ".rb", ".go",
+    # Additional common languages
+    ".jsx", ".tsx", ".h", ".hpp", ".cc", ".cxx", ".kt", ".swift", ".rs", ".dart",
+    # Web technologies
+    ".html", ".css", ".scss", ".sass", ".vue", ".svelte",
+    # Data/config files
+    ".json", ".yaml", ".yml", ".xml", ".toml", ".ini", ".cfg", ".conf",
+    # Shell and scripting
+    ".sh", ".bash", ".zsh", ".fish", ".ps1", ".bat", ".cmd",
+    # Other
+    ".sql", ".r", ".lua", ".perl", ".vim", ".dockerfile"
+})
+_IMAGE_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp"})
+_TEXT_FILE_EXTENSIONS = _MARKDOWN_EXTENSIONS | _DIAGRAM_EXTENSIONS | _TEXT_EXTENSIONS | _CODE_EXTENSIONS
+
+def _lower_suffix(name: str) -> str:
+    """Lowercased Path(name).suffix, found with one rfind"""
+    dot_index = name.rfind('.')
+    return name[dot_index:].lower() if 0 < dot_index < len(name) - 1 else ""
+
+@lru_cache(maxsize=512)
+def _mime_type_for_suffix(suffix: str) -> Optional[str]:
+    return mimetypes.types_map.get(suffix) or mimetypes.guess_type("x" + suffix)[0]
+
+def _is_text_mime_type(suffix: str) -> bool:
+    mime_type = _mime_type_for_suffix(suffix)
+    return mime_type is not None and mime_type.startswith('text/')
+
+def guess_mime_type(file_path: Path) -> Optional[str]:
+    """Guess a file's MIME type from its suffix, cached per suffix"""
+    return _mime_type_for_suffix(_lower_suffix(file_path.name))
+
+def _read_bytes_sync(file_path: Path) -> bytes:
+    """
+    Read a whole file with raw os.read calls
+    
+    The fstat size lets a single read fetch the file, skipping the buffered
+    and text IO layers. Reading continues to EOF if the size was off, e.g.
+    the file changed mid-read.
+    """
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        if len(data) != size or size == 0:
+            chunks = [data]
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            data = b"".join(chunks)
+        return data
+    finally:
+        os.close(fd)
+
+def _read_text_sync(file_path: Path, encoding: str) -> Tuple[str, int]:
+    """
+    Read and decode a text file, translating newlines like open() does
+    
+    Returns the text with its line count, so the count's full scan of the
+    text runs in the worker thread too.
+    """
+    text = _read_bytes_sync(file_path).decode(encoding)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text, _count_lines(text)
+
+# Span scanned with one str.count() call when skipping to a page's start
+_LINE_SKIP_CHUNK = 8192
+
+# Directory entries stat'ed per worker-thread task by list_directory
+_LISTING_BATCH_SIZE = 256
+
+def _count_lines(text: str) -> int:
+    """Count lines the way len(f.readlines()) would"""
+    total = text.count('\n')
+    if text and not text.endswith('\n'):
+        total += 1
+    return total
+
+def _skip_lines(text: str, pos: int, count: int) -> int:
+    """Return the offset just past the next count newlines from pos (or the end)"""
+    length = len(text)
+    remaining = count
+    
+    # Skip whole chunks with C-level counts, then find() within the last one
+    while remaining:
+        chunk_end = pos + _LINE_SKIP_CHUNK
+        if chunk_end >= length:
+            break
+        newlines = text.count('\n', pos, chunk_end)
+        if newlines >= remaining:
+            break
+        remaining -= newlines
+        pos = chunk_end
+    
+    find = text.find
+    for _ in range(remaining):
+        pos = find('\n', pos)
+        if pos == -1:
+            return length
+        pos += 1
+    return pos
+
 class FileHandler:
     """Handles file system operations with security validation"""
     
-    def __init__(self, security_manager: SecurityManager):
+    def __init__(
+        self,
+        security_manager: SecurityManager,
+        metadata_cache_size: int = 1024,
+        listing_cache_size: int = 512,
+        listing_cache_ttl: float = 1.0
+    ):
         self.security = security_manager
+        self.stat_cache = StatCache()
+        
+        # Scanned directory entries, reused while the directory's mtime is
+        # unchanged. Edits to a file don't touch its directory's mtime, so
+        # the TTL bounds how stale an entry's size and modified time can be.
+        self.listing_cache_size = listing_cache_size
+        self.listing_cache_ttl = listing_cache_ttl
+        self._listing_cache: "OrderedDict[Tuple[str, bool], Tuple[int, float, List[FileItem]]]" = OrderedDict()
+        
+        # Built metadata (including the line count, which needs a full read)
+        # keyed by path and reused while the file's stat signature is unchanged
+        self.metadata_cache_size = metadata_cache_size
+        self._metadata_cache: "OrderedDict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]]" = OrderedDict()
         
         # File type categories for rendering priority
-        self.markdown_extensions = {".md", ".markdown", ".mdown", ".mkd"}
-        self.diagram_extensions = {".mmd", ".mermaid"}
-        self.text_extensions = {".txt", ".text", ".log"}
-        self.code_extensions = {
-            # Top 10 languages (Phase 3 priority)
-            ".py", ".js", ".java", ".ts", ".c", ".cpp", ".cs", ".php", ".rb", ".go",
-            # Additional common languages
-            ".jsx", ".tsx", ".h", ".hpp", ".cc", ".cxx", ".kt", ".swift", ".rs", ".dart",
-            # Web technologies
-            ".html", ".css", ".scss", ".sass", ".vue", ".svelte",
-            # Data/config files
-            ".json", ".yaml", ".yml", ".xml", ".toml", ".ini", ".cfg", ".conf",
-            # Shell and scripting
-            ".sh", ".bash", ".zsh", ".fish", ".ps1", ".bat", ".cmd",
-            # Other
-            ".sql", ".r", ".lua", ".perl", ".vim", ".dockerfile"
-        }
-        self.image_extensions = {".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp"}
+        self.markdown_extensions = _MARKDOWN_EXTENSIONS
+        self.diagram_extensions = _DIAGRAM_EXTENSIONS
+        self.text_extensions = _TEXT_EXTENSIONS
+        self.code_extensions = _CODE_EXTENSIONS
+        self.image_extensions = _IMAGE_EXTENSIONS
     
     async def list_directory(
         self, 
@@ -62,53 +186,42 @@ class FileHandler:
         # Validate path security first
         validated_path = self.security.validate_path(dir_path)
         
-        if not validated_path.is_dir():
+        try:
+            dir_stat = self.stat_cache.stat(validated_path)
+        except OSError:
+            dir_stat = None
+        if dir_stat is None or not S_ISDIR(dir_stat.st_mode):
             raise ValueError("Path is not a directory")
         
-        items = []
-        
-        try:
-            for item_path in validated_path.iterdir():
-                # Skip hidden files unless requested
-                if not include_hidden and item_path.name.startswith('.'):
-                    continue
-                
-                # Get item statistics
-                try:
-                    stat = item_path.stat()
-                    
-                    # Determine item type
-                    if item_path.is_dir():
-                        item_type = "directory"
-                        size = 0
-                        extension = None
-                        # Count items in directory
-                        item_count = len([x for x in item_path.iterdir() if not x.name.startswith('.')])
-                    else:
-                        item_type = "file"
-                        size = stat.st_size
-                        extension = item_path.suffix.lower() if item_path.suffix else None
-                        item_count = None
-                    
-                    # Create FileItem
-                    item = FileItem(
-                        name=item_path.name,
-                        type=item_type,
-                        size=size,
-                        modified=datetime.fromtimestamp(stat.st_mtime),
-                        extension=extension,
-                        is_readable=os.access(item_path, os.R_OK),
-                        item_count=item_count
+        key = (str(validated_path), include_hidden)
+        now = time.monotonic()
+        cached = self._listing_cache.get(key)
+        if (cached is not None and cached[0] == dir_stat.st_mtime_ns
+                and now - cached[1] < self.listing_cache_ttl):
+            self._listing_cache.move_to_end(key)
+            items = list(cached[2])
+        else:
+            # Scan in a worker thread so the event loop stays free. Entries
+            # past the first batch are stat'ed by concurrent tasks, which
+            # overlaps round trips on slow-metadata filesystems (NFS, FUSE)
+            loop = asyncio.get_running_loop()
+            items, remaining = await loop.run_in_executor(
+                None, self._scan_directory, validated_path, include_hidden
+            )
+            if remaining:
+                batches = await asyncio.gather(*(
+                    loop.run_in_executor(
+                        None, self._build_items, remaining[i:i + _LISTING_BATCH_SIZE]
                     )
-                    
-                    items.append(item)
-                
-                except (OSError, PermissionError):
-                    # Skip items we can't access
-                    continue
-        
-        except PermissionError:
-            raise PermissionError("Access denied to directory")
+                    for i in range(0, len(remaining), _LISTING_BATCH_SIZE)
+                ))
+                for batch in batches:
+                    items.extend(batch)
+            
+            self._listing_cache[key] = (dir_stat.st_mtime_ns, now, list(items))
+            self._listing_cache.move_to_end(key)
+            while len(self._listing_cache) > self.listing_cache_size:
+                self._listing_cache.popitem(last=False)
         
         # Sort items
         reverse = sort_order.lower() == "desc"
@@ -125,12 +238,79 @@ class FileHandler:
         
         return items
     
+    def _scan_directory(
+        self, dir_path: Path, include_hidden: bool
+    ) -> Tuple[List[FileItem], List[os.DirEntry]]:
+        """
+        List a directory with one os.scandir pass
+        
+        Returns FileItems for the first _LISTING_BATCH_SIZE entries and the
+        remaining entries unbuilt, so small directories need no second hop.
+        """
+        try:
+            with os.scandir(dir_path) as entries:
+                if include_hidden:
+                    listed = list(entries)
+                else:
+                    # Skip hidden files unless requested
+                    listed = [entry for entry in entries if not entry.name.startswith('.')]
+        except PermissionError:
+            raise PermissionError("Access denied to directory")
+        
+        return (
+            self._build_items(listed[:_LISTING_BATCH_SIZE]),
+            listed[_LISTING_BATCH_SIZE:]
+        )
+    
+    def _build_items(self, entries: List[os.DirEntry]) -> List[FileItem]:
+        """Stat directory entries and build their FileItems"""
+        items = []
+        
+        for entry in entries:
+            name = entry.name
+            
+            # Get item statistics
+            try:
+                stat = entry.stat()
+                
+                # Determine item type
+                if S_ISDIR(stat.st_mode):
+                    item_type = "directory"
+                    size = 0
+                    extension = None
+                    # Count items in directory
+                    with os.scandir(entry.path) as children:
+                        item_count = sum(1 for child in children if not child.name.startswith('.'))
+                else:
+                    item_type = "file"
+                    size = stat.st_size
+                    extension = _lower_suffix(name) or None
+                    item_count = None
+                
+                # Create FileItem
+                items.append(FileItem(
+                    name=name,
+                    type=item_type,
+                    size=size,
+                    modified=datetime.fromtimestamp(stat.st_mtime),
+                    extension=extension,
+                    is_readable=os.access(entry.path, os.R_OK),
+                    item_count=item_count
+                ))
+            
+            except (OSError, PermissionError):
+                # Skip items we can't access
+                continue
+        
+        return items
+    
     async def get_file_content(
         self,
         file_path: Path,
         page: int = 1,
         lines_per_page: int = 1000,
-        encoding: str = "utf-8"
+        encoding: str = "utf-8",
+        stat_result: Optional[os.stat_result] = None
     ) -> FileContentResponse:
         """
         Get file content with pagination
@@ -140,6 +320,7 @@ class FileHandler:
             page: Page number (1-based)
             lines_per_page: Lines per page
             encoding: Text encoding
+            stat_result: Stat of the file if the caller already has one
             
         Returns:
             FileContentResponse with content and metadata
@@ -147,36 +328,34 @@ class FileHandler:
         # Validate path security first
         validated_path = self.security.validate_path(file_path)
         
-        if not validated_path.exists():
-            raise FileNotFoundError("File not found")
+        # One stat answers existence, type and size
+        stat = stat_result or self._stat_existing(validated_path)
         
-        if not validated_path.is_file():
+        if not S_ISREG(stat.st_mode):
             raise ValueError("Path is not a file")
         
-        # Get file metadata
-        stat = validated_path.stat()
-        
         # Read file content
-        async with aiofiles.open(validated_path, 'r', encoding=encoding) as f:
-            lines = await f.readlines()
+        text, total_lines = await self._read_text(validated_path, encoding)
         
-        total_lines = len(lines)
         total_pages = (total_lines + lines_per_page - 1) // lines_per_page
         
         # Calculate pagination
         start_line = (page - 1) * lines_per_page
-        end_line = min(start_line + lines_per_page, total_lines)
         
-        # Get page content
-        page_lines = lines[start_line:end_line]
-        content = ''.join(page_lines)
+        # Slice the page out of the text by offset rather than splitting
+        # the whole file into lines
+        if start_line < total_lines:
+            start = _skip_lines(text, 0, start_line)
+            content = text[start:_skip_lines(text, start, lines_per_page)]
+        else:
+            content = ""
         
         # Create metadata
         metadata = FileMetadata(
             size=stat.st_size,
             modified=datetime.fromtimestamp(stat.st_mtime),
-            extension=validated_path.suffix.lower() if validated_path.suffix else None,
-            mime_type=mimetypes.guess_type(str(validated_path))[0] or "text/plain",
+            extension=_lower_suffix(validated_path.name) or None,
+            mime_type=guess_mime_type(validated_path) or "text/plain",
             encoding=encoding,
             line_count=total_lines
         )
@@ -192,18 +371,23 @@ class FileHandler:
         )
         
         return FileContentResponse(
-            path=str(validated_path.relative_to(self.security.base_path)),
+            path=self.security.relative_path(validated_path),
             content=content,
             metadata=metadata,
             pagination=pagination
         )
     
-    async def get_file_metadata(self, file_path: Path) -> Dict[str, Any]:
+    async def get_file_metadata(
+        self,
+        file_path: Path,
+        stat_result: Optional[os.stat_result] = None
+    ) -> Dict[str, Any]:
         """
         Get detailed file metadata
         
         Args:
             file_path: Path to file
+            stat_result: Stat of the file if the caller already has one
             
         Returns:
             Dictionary with file metadata
@@ -211,71 +395,95 @@ class FileHandler:
         # Validate path security first
         validated_path = self.security.validate_path(file_path)
         
-        if not validated_path.exists():
-            raise FileNotFoundError("File not found")
+        stat = stat_result or self._stat_existing(validated_path)
+        is_file = S_ISREG(stat.st_mode)
         
-        stat = validated_path.stat()
+        key = str(validated_path)
+        signature = (stat.st_mtime_ns, stat.st_ctime_ns, stat.st_size)
+        cached = self._metadata_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            self._metadata_cache.move_to_end(key)
+            return dict(cached[1])
         
         metadata = {
-            "path": str(validated_path.relative_to(self.security.base_path)),
+            "path": self.security.relative_path(validated_path),
             "name": validated_path.name,
-            "type": "file" if validated_path.is_file() else "directory",
+            "type": "file" if is_file else "directory",
             "size": stat.st_size,
             "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
             "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-            "extension": validated_path.suffix.lower() if validated_path.suffix else None,
-            "mime_type": mimetypes.guess_type(str(validated_path))[0] if validated_path.is_file() else None,
+            "extension": _lower_suffix(validated_path.name) or None,
+            "mime_type": guess_mime_type(validated_path) if is_file else None,
             "is_readable": os.access(validated_path, os.R_OK),
             "is_writable": os.access(validated_path, os.W_OK),
             "permissions": oct(stat.st_mode)[-3:]
         }
         
         # Add line count for text files
-        if validated_path.is_file() and self._is_text_file(validated_path):
+        if is_file and self._is_text_file(validated_path):
             try:
-                async with aiofiles.open(validated_path, 'r', encoding='utf-8') as f:
-                    lines = await f.readlines()
-                    metadata["line_count"] = len(lines)
+                _, metadata["line_count"] = await self._read_text(validated_path, 'utf-8')
             except (UnicodeDecodeError, PermissionError):
                 metadata["line_count"] = None
         
-        return metadata
+        self._metadata_cache[key] = (signature, metadata)
+        self._metadata_cache.move_to_end(key)
+        while len(self._metadata_cache) > self.metadata_cache_size:
+            self._metadata_cache.popitem(last=False)
+        
+        return dict(metadata)
+    
+    def invalidate(self, path: Optional[Path] = None):
+        """
+        Drop cached data for one path, or everything when path is None
+        
+        Clears the path's stat and metadata, and the listings of the path
+        and of its parent directory.
+        """
+        self.stat_cache.invalidate(path)
+        if path is None:
+            self._metadata_cache.clear()
+            self._listing_cache.clear()
+            return
+        
+        path_str = os.fspath(path)
+        self._metadata_cache.pop(path_str, None)
+        for dir_str in (path_str, os.path.dirname(path_str)):
+            for include_hidden in (False, True):
+                self._listing_cache.pop((dir_str, include_hidden), None)
+    
+    async def _read_text(self, file_path: Path, encoding: str) -> Tuple[str, int]:
+        """Read a text file and count its lines in one worker-thread hop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _read_text_sync, file_path, encoding)
+    
+    def _stat_existing(self, path: Path) -> os.stat_result:
+        """Stat a path through the cache, raising FileNotFoundError if missing"""
+        try:
+            return self.stat_cache.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            raise FileNotFoundError("File not found")
     
     def _is_text_file(self, file_path: Path) -> bool:
         """Check if file is a text file"""
-        extension = file_path.suffix.lower()
         filename = file_path.name
+        extension = _lower_suffix(filename)
         
         # Treat dot files (configuration files) as text files
-        if filename.startswith('.') and extension == '':
-            return True
+        if not extension:
+            return filename.startswith('.')
         
-        # Treat .log files as text files
-        if extension == '.log':
-            return True
-        
-        # Check known text extensions
-        text_extensions = (
-            self.markdown_extensions | 
-            self.diagram_extensions | 
-            self.text_extensions | 
-            self.code_extensions
-        )
-        
-        if extension in text_extensions:
+        # Check known text extensions (.log files included)
+        if extension in _TEXT_FILE_EXTENSIONS:
             return True
         
         # Check MIME type
-        mime_type, _ = mimetypes.guess_type(str(file_path))
-        if mime_type and mime_type.startswith('text/'):
-            return True
-        
-        return False
+        return _is_text_mime_type(extension)
     
     def get_file_category(self, file_path: Path) -> str:
         """Get file category for rendering priority"""
-        extension = file_path.suffix.lower()
         filename = file_path.name
+        extension = _lower_suffix(filename)
         
         # Treat dot files (configuration files) as text files
         if filename.startswith('.') and extension == '':
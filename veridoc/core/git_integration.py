@@ -17,6 +17,7 @@ class GitIntegration:
         self.base_path = Path(base_path) if isinstance(base_path, str) else base_path
         self.git_dir = self.base_path / ".git"
         self._is_git_repo = None
+        self._command_cwd = None
     
     @property
     def is_git_repository(self) -> bool:
@@ -25,6 +26,13 @@ class GitIntegration:
             self._is_git_repo = self.git_dir.exists() or self._find_git_root() is not None
         return self._is_git_repo
     
+    @property
+    def _git_cwd(self) -> str:
+        """Directory Git commands run in, resolved once per instance"""
+        if self._command_cwd is None:
+            self._command_cwd = str(self._find_git_root() or self.base_path)
+        return self._command_cwd
+    
     def _find_git_root(self) -> Optional[Path]:
         """Find the Git root directory by traversing up"""
         current = self.base_path
@@ -132,23 +140,33 @@ class GitIntegration:
             return {"is_repo": False}
         
         try:
+            # The commands are independent, so run them concurrently
+            (
+                branch_result,
+                remote_result,
+                commit_count_result,
+                last_commit_result,
+                status_result,
+            ) = await asyncio.gather(
+                self._run_git_command(["branch", "--show-current"]),
+                self._run_git_command(["remote", "get-url", "origin"]),
+                self._run_git_command(["rev-list", "--count", "HEAD"]),
+                self._run_git_command([
+                    "log", "-1", "--pretty=format:%H|%an|%ad|%s", "--date=iso"
+                ]),
+                self._run_git_command(["status", "--porcelain"]),
+            )
+            
             # Get current branch
-            branch_result = await self._run_git_command(["branch", "--show-current"])
             current_branch = branch_result.strip()
             
             # Get remote URL
-            remote_result = await self._run_git_command(["remote", "get-url", "origin"])
             remote_url = remote_result.strip() if remote_result.strip() else None
             
             # Get commit count
-            commit_count_result = await self._run_git_command(["rev-list", "--count", "HEAD"])
             commit_count = int(commit_count_result.strip()) if commit_count_result.strip().isdigit() else 0
             
             # Get last commit info
-            last_commit_result = await self._run_git_command([
-                "log", "-1", "--pretty=format:%H|%an|%ad|%s", "--date=iso"
-            ])
-            
             last_commit = None
             if last_commit_result.strip():
                 parts = last_commit_result.strip().split('|', 3)
@@ -161,7 +179,6 @@ class GitIntegration:
                     }
             
             # Get status summary
-            status_result = await self._run_git_command(["status", "--porcelain"])
             modified_files = len([line for line in status_result.strip().split('\n') if line])
             
             return {
@@ -206,13 +223,10 @@ class GitIntegration:
     async def _run_git_command(self, args: List[str]) -> str:
         """Run a Git command and return the output"""
         try:
-            # Find git root if different from base_path
-            git_root = self._find_git_root() or self.base_path
-            
             process = await asyncio.create_subprocess_exec(
                 "git",
                 *args,
-                cwd=str(git_root),
+                cwd=self._git_cwd,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
@@ -255,8 +269,7 @@ class GitIntegration:
     def get_relative_path(self, file_path: Path) -> str:
         """Get relative path from repository root"""
         try:
-            git_root = self._find_git_root() or self.base_path
-            return str(file_path.relative_to(git_root))
+            return str(file_path.relative_to(self._git_cwd))
         except ValueError:
             return str(file_path)
     
@@ -269,7 +282,7 @@ class GitIntegration:
             # Run synchronously for tests
             result = subprocess.run(
                 ["git", "status", "--porcelain", "-b"],
-                cwd=str(self._find_git_root() or self.base_path),
+                cwd=self._git_cwd,
                 capture_output=True,
                 text=True,
                 timeout=30
@@ -330,7 +343,7 @@ class GitIntegration:
             
             result = subprocess.run(
                 args,
-                cwd=str(self._find_git_root() or self.base_path),
+                cwd=self._git_cwd,
                 capture_output=True,
                 text=True,
                 timeout=30
@@ -370,7 +383,7 @@ class GitIntegration:
             
             result = subprocess.run(
                 args,
-                cwd=str(self._find_git_root() or self.base_path),
+                cwd=self._git_cwd,
                 capture_output=True,
                 text=True,
                 timeout=30
@@ -392,7 +405,7 @@ class GitIntegration:
         try:
             result = subprocess.run(
                 ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                cwd=str(self._find_git_root() or self.base_path),
+                cwd=self._git_cwd,
                 capture_output=True,
                 text=True,
                 timeout=30
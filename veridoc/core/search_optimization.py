@@ -4,20 +4,35 @@ Indexing and caching for high-performance search
 """
 
 import os
+import re
 import json
 import hashlib
+import heapq
 import time
 import logging
-from typing import Dict, List, Set, Optional, Tuple, Any
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, FrozenSet, List, Set, Optional, Tuple, Any, NamedTuple
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from bisect import bisect_left
+from operator import itemgetter
 import asyncio
 import aiofiles
 from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# A file or directory modified this close to when it was read may have
+# changed again within the same timestamp tick without its mtime moving,
+# so records taken that early are never trusted (git's "racy" entries)
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Index tokens: ASCII word runs of two or more characters
+_WORD_PATTERN = re.compile(r'\b[a-zA-Z0-9_]{2,}\b')
+
 
 @dataclass
 class SearchResult:
@@ -49,6 +64,10 @@ class SearchIndex:
         self.index_file = self.base_path / ".veridoc" / index_file
         self.index: Dict[str, IndexEntry] = {}
         self.word_to_files: Dict[str, Set[str]] = defaultdict(set)
+        # Sorted word_to_files keys for prefix lookups, rebuilt when stale
+        self._sorted_tokens: Optional[List[str]] = None
+        # Lowercased basename per indexed path, filled as searches need them
+        self._names_lower: Dict[str, str] = {}
         self.executor = ThreadPoolExecutor(max_workers=4)
         
         # Create index directory
@@ -69,13 +88,8 @@ class SearchIndex:
     def _tokenize_content(self, content: str) -> Set[str]:
         """Tokenize content for search indexing."""
         # Simple tokenization - can be enhanced with proper NLP
-        import re
-        
-        # Convert to lowercase and extract words
-        words = re.findall(r'\b[a-zA-Z0-9_]+\b', content.lower())
-        
-        # Filter out very short words
-        tokens = {word for word in words if len(word) >= 2}
+        # Convert to lowercase and extract words of two or more characters
+        tokens = set(_WORD_PATTERN.findall(content.lower()))
         
         # Add partial matches for file extensions and paths
         for word in list(tokens):
@@ -172,6 +186,7 @@ class SearchIndex:
             # Update word-to-files mapping
             for token in tokens:
                 self.word_to_files[token].add(relative_path)
+            self._sorted_tokens = None
             
             logger.debug(f"Indexed file: {relative_path} ({len(tokens)} tokens)")
             return True
@@ -187,6 +202,21 @@ class SearchIndex:
                 self.word_to_files[token].discard(file_path)
                 if not self.word_to_files[token]:
                     del self.word_to_files[token]
+            self._sorted_tokens = None
+            self._names_lower.pop(file_path, None)
+    
+    def _token_vocabulary(self) -> List[str]:
+        """Indexed tokens in sorted order, so a prefix's matches are contiguous."""
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self.word_to_files)
+        return self._sorted_tokens
+    
+    def _name_lower(self, file_path: str) -> str:
+        """Lowercased basename of an indexed path, computed once per path."""
+        name_lower = self._names_lower.get(file_path)
+        if name_lower is None:
+            name_lower = self._names_lower[file_path] = os.path.basename(file_path).lower()
+        return name_lower
     
     async def rebuild_index(self, progress_callback: Optional[callable] = None):
         """Rebuild the entire search index."""
@@ -196,6 +226,8 @@ class SearchIndex:
         # Clear existing index
         self.index.clear()
         self.word_to_files.clear()
+        self._sorted_tokens = None
+        self._names_lower.clear()
         
         # Find all files to index
         files_to_index = []
@@ -271,62 +303,70 @@ class SearchIndex:
         if not query or not query.strip():
             return []
         
+        # Lowercase the query once; the scoring loop compares it per candidate
+        query_lower = query.lower()
+        
         # Tokenize query
-        query_tokens = self._tokenize_content(query.lower())
+        query_tokens = self._tokenize_content(query_lower)
         
-        # Find candidate files
-        candidate_files = set()
-        token_matches = {}
+        # Weigh each matching indexed token once for the whole query, so
+        # a token hit by several query tokens credits its files in one pass
+        token_weights: Dict[str, float] = {}
         
         for token in query_tokens:
             # Exact matches
             if token in self.word_to_files:
-                files = self.word_to_files[token]
-                candidate_files.update(files)
-                for file_path in files:
-                    token_matches[file_path] = token_matches.get(file_path, 0) + 1
+                token_weights[token] = token_weights.get(token, 0) + 1
             
-            # Partial matches for longer tokens
+            # Partial matches for longer tokens: binary search to the first
+            # token with this prefix instead of testing the whole vocabulary
             if len(token) >= 3:
-                for indexed_token in self.word_to_files:
-                    if indexed_token.startswith(token):
-                        files = self.word_to_files[indexed_token]
-                        candidate_files.update(files)
-                        for file_path in files:
-                            token_matches[file_path] = token_matches.get(file_path, 0) + 0.5
-        
-        # Score and rank results
-        results = []
-        for file_path in candidate_files:
-            if file_path in self.index:
-                entry = self.index[file_path]
-                
-                # Calculate score
-                score = token_matches.get(file_path, 0)
-                
+                vocabulary = self._token_vocabulary()
+                position = bisect_left(vocabulary, token)
+                while position < len(vocabulary) and vocabulary[position].startswith(token):
+                    indexed_token = vocabulary[position]
+                    token_weights[indexed_token] = token_weights.get(indexed_token, 0) + 0.5
+                    position += 1
+        
+        # Find candidate files: every file holding a weighted token. This
+        # and the scoring loop run per posting and per candidate, so their
+        # hot lookups are bound to locals
+        token_matches: Dict[str, float] = {}
+        matched_weight = token_matches.get
+        for indexed_token, weight in token_weights.items():
+            for file_path in self.word_to_files[indexed_token]:
+                token_matches[file_path] = matched_weight(file_path, 0) + weight
+        
+        # Score every candidate
+        scored: List[Tuple[str, float]] = []
+        index = self.index
+        name_lower = self._name_lower
+        for file_path, score in token_matches.items():
+            if file_path in index:
                 # Boost score for exact query matches in filename
-                filename = os.path.basename(file_path).lower()
-                if query.lower() in filename:
+                if query_lower in name_lower(file_path):
                     score += 2.0
                 
                 # Boost score for file type preferences
                 if file_path.endswith(('.md', '.txt', '.rst')):
                     score += 0.5
                 
-                # Create search result
-                result = SearchResult(
-                    file_path=file_path,
-                    score=score,
-                    matches=[],  # TODO: Extract actual match contexts
-                    file_size=entry.file_size,
-                    last_modified=entry.last_modified,
-                    file_type=Path(file_path).suffix or 'none'
-                )
-                results.append(result)
+                scored.append((file_path, score))
         
-        # Sort by score and limit results
-        results.sort(key=lambda x: x.score, reverse=True)
-        return results[:limit]
+        # Keep the best scores without sorting every candidate (ties keep
+        # candidate order, as a stable sort would), and build results for those
+        results = []
+        for file_path, score in heapq.nlargest(limit, scored, key=itemgetter(1)):
+            entry = self.index[file_path]
+            results.append(SearchResult(
+                file_path=file_path,
+                score=score,
+                matches=[],  # TODO: Extract actual match contexts
+                file_size=entry.file_size,
+                last_modified=entry.last_modified,
+                file_type=Path(file_path).suffix or 'none'
+            ))
+        return results
     
     async def save_index(self):
         """Save index to disk."""
@@ -350,13 +390,22 @@ class SearchIndex:
                     'content_preview': entry.content_preview
                 }
             
-            # Write to temporary file first
-            temp_file = self.index_file.with_suffix('.tmp')
-            async with aiofiles.open(temp_file, 'w') as f:
-                await f.write(json.dumps(index_data, indent=2))
-            
-            # Atomic move
-            temp_file.replace(self.index_file)
+            # Write to a temporary file of our own first: other saves, in
+            # this or another worker process, may be writing at the same time
+            fd, temp_name = tempfile.mkstemp(
+                dir=self.index_file.parent, prefix=self.index_file.stem + '.', suffix='.tmp'
+            )
+            os.close(fd)
+            temp_file = Path(temp_name)
+            try:
+                async with aiofiles.open(temp_file, 'w') as f:
+                    await f.write(json.dumps(index_data, indent=2))
+                
+                # Atomic move
+                temp_file.replace(self.index_file)
+            except BaseException:
+                temp_file.unlink(missing_ok=True)
+                raise
             
             logger.debug(f"Index saved: {len(self.index)} files")
             
@@ -388,6 +437,7 @@ class SearchIndex:
                 # Rebuild word-to-files mapping
                 for token in entry.tokens:
                     self.word_to_files[token].add(file_path)
+            self._sorted_tokens = None
             
             logger.info(f"Index loaded: {len(self.index)} files")
             
@@ -396,6 +446,8 @@ class SearchIndex:
             # Start with empty index
             self.index.clear()
             self.word_to_files.clear()
+            self._sorted_tokens = None
+            self._names_lower.clear()
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get index statistics."""
@@ -408,13 +460,371 @@ class SearchIndex:
         }
 
 
+def _is_fresh_entry(entry: Optional[Tuple[int, int, int, int]], mtime_ns: int, size: int) -> bool:
+    """Check an (id, mtime_ns, size, read_ns) trigram entry against the file on disk."""
+    return (
+        entry is not None and entry[1] == mtime_ns and entry[2] == size
+        and mtime_ns < entry[3] - _RACY_WINDOW_NS
+    )
+
+
+class TrigramCandidates(NamedTuple):
+    """Paths that may contain a query, with the index entries they were read against."""
+    paths: Set[str]
+    entries: Dict[str, Tuple[int, int, int, int]]  # path -> (id, mtime_ns, size, read_ns)
+    
+    def is_fresh(self, path: str, mtime_ns: int, size: int) -> bool:
+        """Check whether path was indexed with this (mtime_ns, size) when paths were read."""
+        return _is_fresh_entry(self.entries.get(path), mtime_ns, size)
+
+
+class TrigramIndex:
+    """
+    Persistent trigram index for pruning content search candidates.
+    
+    Each indexed file stores the byte trigrams of its ASCII-lowercased
+    content. A file can only contain a query if it contains every trigram
+    of the query, so fresh entries missing one can be skipped unread.
+    Entries are keyed by path relative to the base path and are fresh while
+    (mtime_ns, size) matches the file on disk, once that mtime is safely
+    older than when the content was read: a same-size rewrite within one
+    timestamp tick would otherwise leave a stale entry trusted for good.
+    Lookups are driven by the directory walk, so rows left behind by deleted
+    files are never consulted.
+    """
+    
+    # Cap on query trigrams sent to SQLite; any subset is still a valid filter
+    MAX_QUERY_TRIGRAMS = 64
+    
+    # Seconds a write waits on other worker processes' transactions
+    BUSY_TIMEOUT = 10.0
+    
+    def __init__(self, base_path: str, index_file: str = "trigram_index.db",
+                 max_file_size: int = 1024 * 1024):
+        self.base_path = Path(base_path)
+        self.index_file = self.base_path / ".veridoc" / index_file
+        self.max_file_size = max_file_size
+        # path -> (id, mtime_ns, size, time the content read started in ns)
+        self._entries: Dict[str, Tuple[int, int, int, int]] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.index_file), timeout=self.BUSY_TIMEOUT, check_same_thread=False
+            )
+            conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT UNIQUE NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    read_ns INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS postings (
+                    trigram INTEGER NOT NULL,
+                    file_id INTEGER NOT NULL,
+                    PRIMARY KEY (trigram, file_id)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS postings_file_id ON postings (file_id);
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+            if "read_ns" not in columns:
+                # Rows from before read times were kept count as racy, so
+                # they are re-read and re-indexed instead of trusted
+                with conn:
+                    conn.execute(
+                        "ALTER TABLE files ADD COLUMN read_ns INTEGER NOT NULL DEFAULT 0"
+                    )
+            for file_id, path, mtime_ns, size, read_ns in conn.execute(
+                "SELECT id, path, mtime_ns, size, read_ns FROM files"
+            ):
+                self._entries[path] = (file_id, mtime_ns, size, read_ns)
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Trigram index unavailable: {e}")
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether the index database could be opened"""
+        return self._conn is not None
+    
+    @staticmethod
+    def extract_trigrams(content: bytes) -> Set[int]:
+        """Extract ASCII-lowercased byte trigrams packed into integers."""
+        data = content.lower()
+        return {
+            (a << 16) | (b << 8) | c
+            for a, b, c in set(zip(data, data[1:], data[2:]))
+        }
+    
+    def is_fresh(self, path: str, mtime_ns: int, size: int) -> bool:
+        """Check whether the indexed entry for path matches the file on disk."""
+        return _is_fresh_entry(self._entries.get(path), mtime_ns, size)
+    
+    def candidates(self, query: bytes) -> Optional[TrigramCandidates]:
+        """
+        Get indexed paths whose content may contain the query.
+        
+        Only entries that are fresh in the returned snapshot can be ruled
+        out: files indexed afterwards, e.g. by a concurrent search, are
+        missing from the paths even when they contain the query.
+        
+        Args:
+            query: Lowercased query bytes
+            
+        Returns:
+            Candidate relative paths with a snapshot of the entries, or None
+            if the query is too short to filter
+        """
+        trigrams = list(self.extract_trigrams(query))[:self.MAX_QUERY_TRIGRAMS]
+        if not trigrams or self._conn is None:
+            return None
+        
+        placeholders = ",".join("?" * len(trigrams))
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT f.path FROM postings p JOIN files f ON f.id = p.file_id
+                    WHERE p.trigram IN ({placeholders})
+                    GROUP BY p.file_id HAVING COUNT(*) = ?""",
+                (*trigrams, len(trigrams))
+            ).fetchall()
+            entries = dict(self._entries)
+        return TrigramCandidates({row[0] for row in rows}, entries)
+    
+    def update(self, path: str, mtime_ns: int, size: int, content: bytes,
+               read_ns: Optional[int] = None):
+        """
+        Index file content read during a search; larger files are skipped.
+        
+        Args:
+            path: Path relative to the base path
+            mtime_ns: File mtime when the content was read
+            size: File size when the content was read
+            content: File content
+            read_ns: time.time_ns() taken before reading content; defaults to
+                now, which is only safe when content was read just before
+        """
+        if self._conn is None or len(content) > self.max_file_size:
+            return
+        if read_ns is None:
+            read_ns = time.time_ns()
+        
+        trigrams = self.extract_trigrams(content)
+        
+        with self._lock:
+            try:
+                # One transaction per file: committed together or not at all
+                with self._conn:
+                    # _entries is loaded once per process, so another worker
+                    # may already have a row for this path: upsert, then read
+                    # back the row's id and replace whatever postings it has
+                    self._conn.execute(
+                        """INSERT INTO files (path, mtime_ns, size, read_ns) VALUES (?, ?, ?, ?)
+                           ON CONFLICT(path) DO UPDATE SET
+                               mtime_ns = excluded.mtime_ns, size = excluded.size,
+                               read_ns = excluded.read_ns""",
+                        (path, mtime_ns, size, read_ns)
+                    )
+                    file_id = self._conn.execute(
+                        "SELECT id FROM files WHERE path = ?", (path,)
+                    ).fetchone()[0]
+                    self._conn.execute("DELETE FROM postings WHERE file_id = ?", (file_id,))
+                    self._conn.executemany(
+                        "INSERT INTO postings (trigram, file_id) VALUES (?, ?)",
+                        ((trigram, file_id) for trigram in trigrams)
+                    )
+                self._entries[path] = (file_id, mtime_ns, size, read_ns)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to index {path}: {e}")
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        return {
+            'enabled': self.enabled,
+            'indexed_files': len(self._entries),
+            'index_file_size': self.index_file.stat().st_size if self.index_file.exists() else 0
+        }
+
+
+class IndexedName(NamedTuple):
+    """A file name found through the FilenameIndex."""
+    path: str
+    name: str
+
+
+class FilenameIndex:
+    """
+    In-memory trigram index over file names for filename-only search.
+    
+    Each directory record keeps the directory's st_mtime_ns with its file
+    and subdirectory names. Creating, deleting or renaming an entry bumps
+    the directory's mtime, so a query only stats each directory and rescans
+    the ones that changed, instead of touching every file. Matching names
+    come from intersecting the posting lists of the query's trigrams.
+    
+    As with git's racy index entries, a record is only trusted once its
+    mtime is safely older than the scan that produced it: an entry created
+    in the same timestamp tick as the scan leaves the mtime unchanged, so
+    such directories are rescanned until their mtime ages past the window.
+    """
+    
+    # Records whose mtime is this close to their scan time are rescanned
+    RACY_WINDOW_NS = _RACY_WINDOW_NS
+    
+    def __init__(self, pruned_dirs: FrozenSet[str] = frozenset()):
+        self.pruned_dirs = pruned_dirs
+        # dir path -> (mtime_ns, file names, subdirectory names, scan time in ns)
+        self._dirs: Dict[str, Tuple[int, Tuple[str, ...], Tuple[str, ...], int]] = {}
+        self._postings: Dict[int, Set[str]] = defaultdict(set)
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _name_trigrams(name_lower: str) -> Set[int]:
+        return TrigramIndex.extract_trigrams(name_lower.encode('utf-8'))
+    
+    def _index_names(self, directory: str, names, add: bool):
+        for name in names:
+            path = os.path.join(directory, name)
+            for trigram in self._name_trigrams(name.lower()):
+                if add:
+                    self._postings[trigram].add(path)
+                else:
+                    postings = self._postings.get(trigram)
+                    if postings is not None:
+                        postings.discard(path)
+                        if not postings:
+                            del self._postings[trigram]
+    
+    def _drop_tree(self, directory: str):
+        """Forget a removed directory and everything indexed below it."""
+        record = self._dirs.pop(directory, None)
+        if record is None:
+            return
+        self._index_names(directory, record[1], add=False)
+        for subdir in record[2]:
+            self._drop_tree(os.path.join(directory, subdir))
+    
+    def _scan(self, directory: str, mtime_ns: int) -> Tuple[str, ...]:
+        """Re-read one changed directory, returning its subdirectory names."""
+        # Taken before reading, so anything created during the scan is racy
+        scanned_ns = time.time_ns()
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.pruned_dirs:
+                                subdirs.append(entry.name)
+                        elif entry.is_file(follow_symlinks=False):
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            self._drop_tree(directory)
+            return ()
+        
+        old = self._dirs.get(directory)
+        if old is not None:
+            old_files = set(old[1])
+            new_files = set(files)
+            self._index_names(directory, old_files - new_files, add=False)
+            self._index_names(directory, new_files - old_files, add=True)
+            for subdir in set(old[2]).difference(subdirs):
+                self._drop_tree(os.path.join(directory, subdir))
+        else:
+            self._index_names(directory, files, add=True)
+        
+        self._dirs[directory] = (mtime_ns, tuple(files), tuple(subdirs), scanned_ns)
+        return tuple(subdirs)
+    
+    def _refresh(self, root: str, include_hidden: bool) -> Set[str]:
+        """Bring records under root up to date, returning the directories walked."""
+        walked = set()
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                self._drop_tree(directory)
+                continue
+            
+            record = self._dirs.get(directory)
+            if (record is not None and record[0] == mtime_ns
+                    and mtime_ns < record[3] - self.RACY_WINDOW_NS):
+                subdirs = record[2]
+            else:
+                subdirs = self._scan(directory, mtime_ns)
+            
+            walked.add(directory)
+            for subdir in subdirs:
+                if include_hidden or not subdir.startswith('.'):
+                    stack.append(os.path.join(directory, subdir))
+        return walked
+    
+    def refresh(self, root: str, include_hidden: bool = False):
+        """Index (or re-validate) the tree under root, e.g. to warm the index."""
+        with self._lock:
+            self._refresh(root, include_hidden)
+    
+    def matches(self, root: str, query_lower: str, include_hidden: bool = False) -> List[IndexedName]:
+        """
+        Find files under root whose lowercased name contains the query.
+        
+        Args:
+            root: Absolute directory to search
+            query_lower: Lowercased query
+            include_hidden: Also search inside hidden directories
+            
+        Returns:
+            Matching files sorted by path
+        """
+        with self._lock:
+            walked = self._refresh(root, include_hidden)
+            
+            trigrams = self._name_trigrams(query_lower)
+            if trigrams:
+                postings = sorted(
+                    (self._postings.get(trigram, ()) for trigram in trigrams), key=len
+                )
+                paths = set(postings[0]).intersection(*postings[1:])
+            else:
+                # Too short to filter on: every name in the walked directories
+                paths = {
+                    os.path.join(directory, name)
+                    for directory in walked
+                    for name in self._dirs[directory][1]
+                }
+        
+        found = []
+        for path in paths:
+            directory, name = os.path.split(path)
+            if directory in walked and query_lower in name.lower():
+                found.append(IndexedName(path, name))
+        found.sort()
+        return found
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        return {
+            'indexed_directories': len(self._dirs),
+            'indexed_files': sum(len(record[1]) for record in self._dirs.values()),
+        }
+
+
 class SearchCache:
     """LRU cache for search results."""
     
     def __init__(self, max_size: int = 1000):
         self.max_size = max_size
-        self.cache: Dict[str, Tuple[List[SearchResult], float]] = {}
-        self.access_order: List[str] = []
+        # Least recently used first; hits move to the end in O(1)
+        self.cache: "OrderedDict[str, Tuple[List[SearchResult], float]]" = OrderedDict()
     
     def _make_key(self, query: str, limit: int) -> str:
         """Create cache key from search parameters."""
@@ -424,19 +834,17 @@ class SearchCache:
         """Get cached search results."""
         key = self._make_key(query, limit)
         
-        if key in self.cache:
-            results, timestamp = self.cache[key]
+        cached = self.cache.get(key)
+        if cached is not None:
+            results, timestamp = cached
             
             # Check if cache entry is still valid (5 minutes)
             if time.time() - timestamp < 300:
-                # Move to end of access order
-                self.access_order.remove(key)
-                self.access_order.append(key)
+                self.cache.move_to_end(key)
                 return results
             else:
                 # Expired
                 del self.cache[key]
-                self.access_order.remove(key)
         
         return None
     
@@ -444,23 +852,17 @@ class SearchCache:
         """Cache search results."""
         key = self._make_key(query, limit)
         
-        # Remove if already exists
-        if key in self.cache:
-            self.access_order.remove(key)
-        
-        # Add new entry
+        # Add or refresh the entry as most recently used
         self.cache[key] = (results, time.time())
-        self.access_order.append(key)
+        self.cache.move_to_end(key)
         
         # Evict oldest if over limit
         while len(self.cache) > self.max_size:
-            oldest_key = self.access_order.pop(0)
-            del self.cache[oldest_key]
+            self.cache.popitem(last=False)
     
     def clear(self):
         """Clear all cached results."""
         self.cache.clear()
-        self.access_order.clear()
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -519,7 +921,7 @@ class OptimizedSearchEngine:
             results = []
             query_lower = query.lower()
             for file_path in self.index.index:
-                if query_lower in os.path.basename(file_path).lower():
+                if query_lower in self.index._name_lower(file_path):
                     entry = self.index.index[file_path]
                     result = SearchResult(
                         file_path=file_path,
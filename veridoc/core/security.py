@@ -4,16 +4,89 @@ Path validation and access control
 """
 
 import os
+import re
+import time
+import threading
 import urllib.parse
 import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Union
+from typing import Tuple, Union
+
+# Characters not allowed in filenames, matched in a single scan
+_DANGEROUS_FILENAME_CHARS = re.compile(r'[<>:"|?*\x00]')
+
+# Reserved device names (Windows)
+_RESERVED_FILENAMES = frozenset({
+    "CON", "PRN", "AUX", "NUL",
+    "COM1", "COM2", "COM3", "COM4", "COM5", "COM6", "COM7", "COM8", "COM9",
+    "LPT1", "LPT2", "LPT3", "LPT4", "LPT5", "LPT6", "LPT7", "LPT8", "LPT9"
+})
+_RESERVED_FILENAME_MAX_LEN = 4
+
+# URL schemes, null bytes, Windows drive letters and UNC prefixes,
+# rejected in one scan of the user path
+_UNSAFE_PATH_PATTERN = re.compile(
+    r'(?P<url>://)|(?P<null>\x00)|^(?:(?P<drive>.:)|(?P<unc>\\\\))',
+    re.DOTALL
+)
+_UNSAFE_PATH_MESSAGES = {
+    "url": "URLs not allowed in path",
+    "null": "Null bytes not allowed in path",
+    "drive": "Windows absolute paths not allowed",
+    "unc": "UNC paths not allowed",
+}
+
+# ASCII punctuation _normalize_and_decode_path treats as suspicious, for a
+# single regex scan in place of the per-character category lookups
+_SUSPICIOUS_ASCII_CHARS = re.compile('[%s]' % re.escape(''.join(
+    char for char in map(chr, range(128))
+    if unicodedata.category(char).startswith('P') and char not in './\\-_'
+)))
+
+# User paths that always mean the base directory
+_BASE_PATH_ALIASES = frozenset({"", "/", ".", "./"})
+
+# File extensions accepted by validate_file_extension
+_ALLOWED_EXTENSIONS = frozenset({
+    '.md', '.txt', '.py', '.js', '.json', '.yaml', '.yml', 
+    '.html', '.css', '.xml', '.rst', '.csv', '.toml',
+    '.ini', '.cfg', '.conf', '.sh', '.bat', '.ts', '.tsx',
+    '.jsx', '.vue', '.svelte', '.go', '.rs', '.cpp', '.c',
+    '.h', '.hpp', '.java', '.kt', '.swift', '.rb', '.php',
+    '.pl', '.r', '.scala', '.clj', '.hs', '.elm', '.dart',
+    '.lua', '.vim', '.sql', '.dockerfile', '.gitignore',
+    '.gitattributes', '.editorconfig'
+})
 
 class SecurityManager:
     """Manages file system security and path validation"""
 
-    def __init__(self, base_path: Union[str, Path]):
+    def __init__(
+        self,
+        base_path: Union[str, Path],
+        path_cache_size: int = 1024,
+        path_cache_ttl: float = 1.0,
+        reject_cache_size: int = 4096
+    ):
         self.base_path = Path(base_path).resolve()
+        self._base_str = str(self.base_path)
+        self._base_prefix = os.path.join(self._base_str, "")
+        self._base_prefix_len = len(self._base_prefix)
+        
+        # Recently validated paths; the short TTL bounds how long a symlink
+        # retargeted after validation can go unnoticed
+        self.path_cache_size = path_cache_size
+        self.path_cache_ttl = path_cache_ttl
+        self._path_cache: "OrderedDict[Tuple[Path, str], Tuple[Path, float]]" = OrderedDict()
+        self._path_cache_lock = threading.Lock()
+        
+        # Recently rejected paths and their error messages, so repeated
+        # probes of the same path are turned away without revalidating.
+        # Same TTL, since some rejections depend on the file system.
+        self.reject_cache_size = reject_cache_size
+        self._reject_cache: "OrderedDict[Tuple[Path, str], Tuple[str, float]]" = OrderedDict()
 
         # Ensure base path exists
         if not self.base_path.exists():
@@ -22,6 +95,31 @@ class SecurityManager:
         if not self.base_path.is_dir():
             raise ValueError(f"Base path is not a directory: {self.base_path}")
     
+    @property
+    def base_prefix(self) -> str:
+        """Resolved base path with one trailing separator, even for the root."""
+        return self._base_prefix
+
+    @classmethod
+    def get(cls, base_path: Union[str, Path]) -> "SecurityManager":
+        """
+        Get the shared SecurityManager for a base path, creating it on first use.
+
+        Args:
+            base_path: Base directory path, in any spelling of it
+
+        Returns:
+            SecurityManager instance shared by all callers naming the same
+            resolved directory
+        """
+        return cls._get_resolved(Path(base_path).resolve())
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _get_resolved(cls, base_path: Path) -> "SecurityManager":
+        """Create or reuse the instance for an already resolved base path."""
+        return cls(base_path)
+    
     def _normalize_and_decode_path(self, user_path: str) -> str:
         """
         Normalize and decode path to catch advanced evasion techniques.
@@ -52,6 +150,14 @@ class SecurityManager:
             if "\x00" in user_path:
                 raise ValueError("Null bytes not allowed in path")
         
+        # ASCII paths are unchanged by normalization and lookalike
+        # replacement, so only the punctuation check applies
+        if user_path.isascii():
+            suspicious_chars = _SUSPICIOUS_ASCII_CHARS.findall(user_path)
+            if suspicious_chars:
+                raise ValueError(f"Suspicious Unicode characters in path: {suspicious_chars}")
+            return user_path
+        
         # Unicode normalization to catch fullwidth and other Unicode evasions
         # Convert to NFD (decomposed) form, then back to NFC (composed)
         user_path = unicodedata.normalize('NFD', user_path)
@@ -90,6 +196,10 @@ class SecurityManager:
         """
         Validate that user path is safe and within base path.
 
+        Results are cached briefly, so repeated requests for the same path
+        skip decoding and realpath(), and repeated probes of a rejected path
+        fail straight away.
+
         Args:
             user_path: User-provided path (relative to base)
 
@@ -107,6 +217,56 @@ class SecurityManager:
         if hasattr(user_path, '__fspath__'):  # Path-like object
             user_path = str(user_path)
         
+        # The base directory itself (directory listing root) needs no checks
+        if user_path in _BASE_PATH_ALIASES:
+            return self.base_path
+        
+        key = (self.base_path, user_path)
+        now = time.monotonic()
+        with self._path_cache_lock:
+            cached = self._path_cache.get(key)
+            if cached is not None and now - cached[1] < self.path_cache_ttl:
+                self._path_cache.move_to_end(key)
+                return cached[0]
+            
+            rejected = self._reject_cache.get(key)
+            if rejected is not None and now - rejected[1] < self.path_cache_ttl:
+                self._reject_cache.move_to_end(key)
+                raise ValueError(rejected[0])
+        
+        try:
+            full_path = self._validate_path_uncached(user_path)
+        except ValueError as e:
+            with self._path_cache_lock:
+                self._reject_cache[key] = (str(e), now)
+                self._reject_cache.move_to_end(key)
+                while len(self._reject_cache) > self.reject_cache_size:
+                    self._reject_cache.popitem(last=False)
+            raise
+        
+        with self._path_cache_lock:
+            self._path_cache[key] = (full_path, now)
+            self._path_cache.move_to_end(key)
+            while len(self._path_cache) > self.path_cache_size:
+                self._path_cache.popitem(last=False)
+        
+        return full_path
+    
+    def clear_path_cache(self):
+        """Forget all cached path validations and rejections"""
+        with self._path_cache_lock:
+            self._path_cache.clear()
+            self._reject_cache.clear()
+    
+    def invalidate_path(self, user_path: Union[str, Path]):
+        """Forget the cached validation or rejection of one user path"""
+        key = (self.base_path, os.fspath(user_path))
+        with self._path_cache_lock:
+            self._path_cache.pop(key, None)
+            self._reject_cache.pop(key, None)
+    
+    def _validate_path_uncached(self, user_path: str) -> Path:
+        """Full validation of a user path string; see validate_path"""
         # Handle empty string as base path
         if user_path == "":
             return self.base_path
@@ -114,13 +274,10 @@ class SecurityManager:
         # Apply advanced normalization and decoding to catch evasion attempts
         user_path = self._normalize_and_decode_path(user_path)
         
-        # Check for URL schemes
-        if "://" in user_path:
-            raise ValueError("URLs not allowed in path")
-        
-        # Check for Windows absolute paths
-        if len(user_path) >= 2 and user_path[1] == ':':
-            raise ValueError("Windows absolute paths not allowed")
+        # Check for URL schemes, null bytes, Windows absolute and UNC paths
+        unsafe = _UNSAFE_PATH_PATTERN.search(user_path)
+        if unsafe:
+            raise ValueError(_UNSAFE_PATH_MESSAGES[unsafe.lastgroup])
         
         # Check for Unix absolute paths
         if user_path.startswith('/'):
@@ -129,60 +286,68 @@ class SecurityManager:
                 return self.base_path
             
             # Allow absolute paths if they're within our base path
-            try:
-                abs_path = Path(user_path).resolve()
-                # Try to get relative path to base_path
-                rel_path = abs_path.relative_to(self.base_path.resolve())
-                user_path = str(rel_path)
-            except ValueError:
+            abs_path = os.path.realpath(user_path)
+            if abs_path == self._base_str:
+                user_path = "."
+            elif abs_path.startswith(self._base_prefix):
+                # Continue with the path relative to base_path
+                user_path = abs_path[self._base_prefix_len:]
+            else:
                 # Path is not within base path
                 raise ValueError("Absolute paths outside base directory not allowed")
         
-        # Check for UNC paths (Windows network paths)
-        if user_path.startswith('\\\\') or user_path.startswith('//'):
-            raise ValueError("UNC paths not allowed")
-            
-        # Check for null bytes (redundant but kept for clarity)
-        if "\x00" in user_path:
-            raise ValueError("Null bytes not allowed in path")
-
-        # Check for dangerous parent directory traversal
-        normalized = os.path.normpath(user_path)
-        if normalized.startswith('..') or '/../' in normalized or normalized == '..':
+        # Check for dangerous parent directory traversal. user_path is
+        # relative here, and normpath() only leaves '..' components at the
+        # start of a relative path, so one prefix test covers them all.
+        # Without '..' in the input there is nothing to normalize away.
+        if '..' in user_path and os.path.normpath(user_path).startswith('..'):
             raise ValueError("Path traversal not allowed")
 
         # Remove leading slashes and normalize (after security checks)
         user_path = user_path.strip("/")
 
-        # Construct full path
+        # Construct full path. realpath() still resolves every component, so
+        # a symlinked directory part way down cannot lead outside the base;
+        # the containment check itself is a plain string prefix test.
+        if user_path == "" or user_path == ".":
+            return self.base_path
+        
         try:
-            if user_path == "" or user_path == ".":
-                full_path = self.base_path
-            else:
-                full_path = (self.base_path / user_path).resolve()
+            full_str = os.path.realpath(os.path.join(self._base_str, user_path))
         except (OSError, ValueError) as e:
             raise ValueError(f"Invalid path: {e}")
 
-        # Check if resolved path is within base path
-        try:
-            full_path.relative_to(self.base_path)
-        except ValueError:
+        # Check if resolved path is within base path. realpath() has followed
+        # every symbolic link, the final component included, so this also
+        # rejects links whose target lies outside the base.
+        if full_str == self._base_str:
+            return self.base_path
+        if not full_str.startswith(self._base_prefix):
             raise ValueError("Path outside base directory")
 
-        # Check for symbolic links (security risk)
-        if full_path.is_symlink():
-            # Check if symlink target is within base path
-            try:
-                target = full_path.readlink()
-                if target.is_absolute():
-                    raise ValueError("Absolute symbolic links not allowed")
+        return Path(full_str)
+    
+    def relative_path(self, path: Union[str, Path]) -> str:
+        """
+        Get a validated path relative to the base path.
+
+        Same result as str(path.relative_to(base_path)), by string slicing.
 
-                resolved_target = (full_path.parent / target).resolve()
-                resolved_target.relative_to(self.base_path)
-            except (ValueError, OSError):
-                raise ValueError("Symbolic link points outside base directory")
+        Args:
+            path: Resolved path inside the base path
 
-        return full_path
+        Returns:
+            Relative path string, "." for the base path itself
+
+        Raises:
+            ValueError: If path is not inside the base path
+        """
+        path_str = os.fspath(path)
+        if path_str == self._base_str:
+            return "."
+        if not path_str.startswith(self._base_prefix):
+            raise ValueError(f"{path_str} is not within {self._base_str}")
+        return path_str[self._base_prefix_len:]
     
     def sanitize_input(self, user_input: str) -> str:
         """
@@ -217,20 +382,15 @@ class SecurityManager:
             True if filename is safe
         """
         # Check for dangerous characters
-        dangerous_chars = ["<", ">", ":", '"', "|", "?", "*", "\x00"]
-
-        for char in dangerous_chars:
-            if char in filename:
-                return False
-
-        # Check for reserved names (Windows)
-        reserved_names = [
-            "CON", "PRN", "AUX", "NUL",
-            "COM1", "COM2", "COM3", "COM4", "COM5", "COM6", "COM7", "COM8", "COM9",
-            "LPT1", "LPT2", "LPT3", "LPT4", "LPT5", "LPT6", "LPT7", "LPT8", "LPT9"
-        ]
+        if _DANGEROUS_FILENAME_CHARS.search(filename):
+            return False
 
-        if filename.upper() in reserved_names:
+        # Check for reserved names (Windows); upper() never shortens a
+        # string, so longer names cannot match
+        if (
+            len(filename) <= _RESERVED_FILENAME_MAX_LEN
+            and filename.upper() in _RESERVED_FILENAMES
+        ):
             return False
 
         return True
@@ -273,18 +433,9 @@ class SecurityManager:
             # Files without extension (README, Makefile, etc.)
             return True
             
-        ext = Path(filename).suffix.lower()
-        
-        # Allowed extensions
-        allowed_extensions = {
-            '.md', '.txt', '.py', '.js', '.json', '.yaml', '.yml', 
-            '.html', '.css', '.xml', '.rst', '.csv', '.toml',
-            '.ini', '.cfg', '.conf', '.sh', '.bat', '.ts', '.tsx',
-            '.jsx', '.vue', '.svelte', '.go', '.rs', '.cpp', '.c',
-            '.h', '.hpp', '.java', '.kt', '.swift', '.rb', '.php',
-            '.pl', '.r', '.scala', '.clj', '.hs', '.elm', '.dart',
-            '.lua', '.vim', '.sql', '.dockerfile', '.gitignore',
-            '.gitattributes', '.editorconfig'
-        }
+        # Same result as Path(filename).suffix without building a Path
+        name = filename.rstrip('/').rpartition('/')[2]
+        dot_index = name.rfind('.')
+        ext = name[dot_index:].lower() if 0 < dot_index < len(name) - 1 else ""
         
-        return ext in allowed_extensions
\ No newline at end of file
+        return ext in _ALLOWED_EXTENSIONS
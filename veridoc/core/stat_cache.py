@@ -0,0 +1,89 @@
+"""
+VeriDoc Stat Cache
+Short-lived file metadata cache for hot request paths
+"""
+
+import errno
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class StatCache:
+    """Bounded LRU cache of os.stat results with a short TTL
+
+    Missing paths are cached too, so repeated lookups of a path that
+    doesn't exist raise FileNotFoundError without another stat call.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 1.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[os.stat_result], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def stat(self, path) -> os.stat_result:
+        """
+        Get stat result for path, served from cache while fresh
+
+        Args:
+            path: File system path (str or path-like)
+
+        Returns:
+            os.stat_result for the path
+
+        Raises:
+            OSError: If the path cannot be stat'ed (e.g. FileNotFoundError)
+        """
+        key = os.fspath(path)
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and now - cached[1] < self.ttl:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                result = cached[0]
+                if result is None:
+                    raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), key)
+                return result
+            self._misses += 1
+
+        try:
+            result = os.stat(key)
+        except FileNotFoundError:
+            self._store(key, None, now)
+            raise
+
+        self._store(key, result, now)
+        return result
+
+    def _store(self, key: str, result: Optional[os.stat_result], now: float):
+        """Insert an entry (None for a missing path) and evict the oldest"""
+        with self._lock:
+            self._entries[key] = (result, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: Optional[Any] = None):
+        """Drop one cached path, or the whole cache when path is None"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.fspath(path), None)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        total = self._hits + self._misses
+        return {
+            "cache_size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hit_ratio": self._hits / total if total else 0,
+        }
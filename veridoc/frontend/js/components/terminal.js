@@ -45,13 +45,16 @@ class TerminalComponent {
                 this.terminal.loadAddon(this.fitAddon);
             }
             
+            // Input is sent as binary frames; text frames are control messages
+            this.encoder = new TextEncoder();
+            
             // Generate terminal ID
             this.terminalId = 'terminal_' + Math.random().toString(36).substr(2, 9);
             
             // Terminal event handlers
             this.terminal.onData(data => {
                 if (this.websocket && this.websocket.readyState === WebSocket.OPEN) {
-                    this.websocket.send(data);
+                    this.websocket.send(this.encoder.encode(data));
                 }
             });
             
@@ -114,6 +117,8 @@ class TerminalComponent {
             const wsUrl = `${protocol}//${window.location.host}/ws/terminal/${this.terminalId}`;
             
             this.websocket = new WebSocket(wsUrl);
+            // Terminal output arrives as raw bytes
+            this.websocket.binaryType = 'arraybuffer';
             
             this.websocket.onopen = () => {
                 this.isConnected = true;
@@ -132,7 +137,9 @@ class TerminalComponent {
             
             this.websocket.onmessage = (event) => {
                 if (this.terminal) {
-                    this.terminal.write(event.data);
+                    this.terminal.write(
+                        typeof event.data === 'string' ? event.data : new Uint8Array(event.data)
+                    );
                 }
             };
             
@@ -202,7 +209,7 @@ class TerminalComponent {
     // Send command to terminal
     sendCommand(command) {
         if (this.isReady()) {
-            this.websocket.send(command + '\r');
+            this.websocket.send(this.encoder.encode(command + '\r'));
         }
     }
     
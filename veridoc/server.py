@@ -5,33 +5,35 @@ AI-Optimized Documentation Browser
 """
 
 import os
-import sys
+import time
 import logging
 from pathlib import Path
-from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, JSONResponse
 import uvicorn
-from typing import Optional, List
+from typing import Any, Dict, Iterator, Optional, List, Tuple, NamedTuple
 import json
-import mimetypes
+import orjson
 from datetime import datetime
 import asyncio
 import subprocess
 import pty
-import select
 import termios
 import struct
 import fcntl
+import mmap
+from stat import S_ISDIR, S_ISREG
+from functools import lru_cache
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Add project root to path
-sys.path.append(str(Path(__file__).parent))
-
 from .core.security import SecurityManager
-from .core.file_handler import FileHandler
+from .core.file_handler import FileHandler, guess_mime_type
+from .core.stat_cache import StatCache
 from .core.config import Config
 from .core.git_integration import GitIntegration
 from .core.terminal_security import TerminalSecurityManager
@@ -49,7 +51,7 @@ from .core.performance_monitor import (
     performance_monitor,
     async_performance_tracking
 )
-from .core.search_optimization import OptimizedSearchEngine
+from .core.search_optimization import FilenameIndex, OptimizedSearchEngine, TrigramIndex
 from .models.api_models import (
     FileListResponse,
     FileItem,
@@ -59,15 +61,65 @@ from .models.api_models import (
     ErrorResponse
 )
 
-# Initialize configuration
-config = Config()
+# Core components are built once per process on first use. Routes receive
+# them through Depends; clearing the caches (see reset_components) rebuilds
+# them all against the current configuration.
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    return Config()
+
+@lru_cache(maxsize=1)
+def get_security_manager() -> SecurityManager:
+    return SecurityManager.get(get_config().base_path)
+
+@lru_cache(maxsize=1)
+def get_file_handler() -> FileHandler:
+    return FileHandler(get_security_manager())
+
+@lru_cache(maxsize=1)
+def get_git_integration() -> GitIntegration:
+    return GitIntegration(get_config().base_path)
+
+@lru_cache(maxsize=1)
+def get_terminal_security() -> TerminalSecurityManager:
+    return TerminalSecurityManager(get_config().base_path)
+
+@lru_cache(maxsize=1)
+def get_search_engine() -> OptimizedSearchEngine:
+    return OptimizedSearchEngine(get_config().base_path)
+
+@lru_cache(maxsize=1)
+def get_trigram_index() -> TrigramIndex:
+    return TrigramIndex(get_config().base_path)
 
-# Initialize core components (before app creation so they're available in lifespan)
-security_manager = SecurityManager(config.base_path)
-file_handler = FileHandler(security_manager)
-git_integration = GitIntegration(config.base_path)
-terminal_security = TerminalSecurityManager(config.base_path)
-search_engine = OptimizedSearchEngine(config.base_path)
+@lru_cache(maxsize=1)
+def get_filename_index() -> FilenameIndex:
+    return FilenameIndex(_SEARCH_PRUNED_DIRS)
+
+def reset_components():
+    """Drop cached components so the next use rebuilds them from Config"""
+    for factory in (
+        get_config,
+        get_security_manager,
+        get_file_handler,
+        get_git_integration,
+        get_terminal_security,
+        get_search_engine,
+        get_trigram_index,
+        get_filename_index,
+    ):
+        factory.cache_clear()
+
+# Shared pool for concurrent per-file content scans in /api/search
+_search_executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+_SEARCH_BATCH_SIZE = 64
+_SEARCH_MMAP_THRESHOLD = 1024 * 1024
+_SEARCH_SCAN_WINDOW = 1024 * 1024
+# Dependency, cache and build directories never worth searching
+_SEARCH_PRUNED_DIRS = frozenset({
+    '.git', 'node_modules', '__pycache__', '.venv', 'venv', '.tox',
+    'dist', 'build', '.idea', '.mypy_cache'
+})
 
 # Lifespan context manager for startup/shutdown events
 from contextlib import asynccontextmanager
@@ -77,12 +129,27 @@ async def lifespan(app: FastAPI):
     # Startup
     await performance_monitor.start_monitoring()
     logger.info("Performance monitoring started")
-    await search_engine.start_background_updates()
+    await get_search_engine().start_background_updates()
     logger.info("Search engine background updates started")
+    # Build the filename index off the event loop so the first filename
+    # search doesn't pay for the whole walk
+    asyncio.get_running_loop().run_in_executor(
+        None, get_filename_index().refresh, str(get_config().base_path)
+    )
     yield
     # Shutdown
     logger.info("Shutting down VeriDoc")
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson
+    
+    Used for routes without a response_model; routes with one are left to
+    FastAPI's own Pydantic serialization.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
 app = FastAPI(
     title="VeriDoc API",
     description="AI-Optimized Documentation Browser API",
@@ -94,14 +161,19 @@ app = FastAPI(
 frontend_path = Path(__file__).parent / "frontend"
 app.mount("/static", StaticFiles(directory=str(frontend_path)), name="static")
 
+index_path = str(frontend_path / "index.html")
+# Lets the index page skip Starlette's per-request stat while still picking
+# up frontend edits within a second
+frontend_stat_cache = StatCache(max_entries=16)
+
 @app.get("/", response_class=FileResponse)
 async def serve_index():
     """Serve the main application"""
-    return FileResponse(str(frontend_path / "index.html"))
+    return FileResponse(index_path, stat_result=frontend_stat_cache.stat(index_path))
 
 @app.get("/api/health", response_model=HealthResponse)
 @async_performance_tracking
-async def health_check():
+async def health_check(config: Config = Depends(get_config)):
     """Health check endpoint with real metrics"""
     metrics = performance_monitor.get_current_metrics()
     health_check = performance_monitor.check_health()
@@ -123,7 +195,10 @@ async def get_files(
     sort_by: str = Query(
         "name", description="Sort field: name, size, modified"
     ),
-    sort_order: str = Query("asc", description="Sort order: asc, desc")
+    sort_order: str = Query("asc", description="Sort order: asc, desc"),
+    config: Config = Depends(get_config),
+    security_manager: SecurityManager = Depends(get_security_manager),
+    file_handler: FileHandler = Depends(get_file_handler)
 ):
     """Get directory listing"""
     # Default empty path to root
@@ -152,12 +227,15 @@ async def get_files(
         else:
             raise PermissionError(f"Invalid path: {path}", resource=path)
     
-    if not safe_path.exists():
+    # One stat answers both existence and type
+    try:
+        path_stat = file_handler.stat_cache.stat(safe_path)
+    except (FileNotFoundError, NotADirectoryError):
         raise NotFoundError(
             f"Directory not found: {path}", resource_type="directory"
         )
     
-    if not safe_path.is_dir():
+    if not S_ISDIR(path_stat.st_mode):
         raise ValidationError(
             f"Path is not a directory: {path}", field="path"
         )
@@ -174,7 +252,7 @@ async def get_files(
     parent_path = (
         "/"
         if safe_path == config.base_path
-        else str(safe_path.parent.relative_to(config.base_path))
+        else security_manager.relative_path(safe_path.parent)
     )
     
     return FileListResponse(
@@ -189,22 +267,36 @@ async def get_file_content(
     path: str = Query(..., description="Relative file path"),
     page: int = Query(1, ge=1, description="Page number"),
     lines_per_page: int = Query(1000, ge=1, le=10000, description="Lines per page"),
-    encoding: str = Query("utf-8", description="Text encoding")
+    encoding: str = Query("utf-8", description="Text encoding"),
+    config: Config = Depends(get_config),
+    security_manager: SecurityManager = Depends(get_security_manager),
+    file_handler: FileHandler = Depends(get_file_handler)
 ):
     """Get file content with pagination"""
     try:
         # Validate and resolve path
         safe_path = security_manager.validate_path(path)
         
+        # Stat once and reuse it for existence, size and the handler
+        stat_result = file_handler._stat_existing(safe_path)
+        if not S_ISREG(stat_result.st_mode):
+            raise ValueError("Path is not a file")
+        
         # Check if file is a text file using the file handler's method
         if not file_handler._is_text_file(safe_path):
             # For non-text files, stream the file directly
-            mime_type, _ = mimetypes.guess_type(safe_path)
-            return FileResponse(safe_path, media_type=mime_type)
+            mime_type = guess_mime_type(safe_path)
+            # Reuse our stat so Starlette skips its own threaded stat call
+            return FileResponse(
+                safe_path,
+                media_type=mime_type,
+                stat_result=stat_result,
+                filename=safe_path.name,
+                content_disposition_type="inline"
+            )
         
         # For text files, proceed with pagination
-        file_size = safe_path.stat().st_size
-        if file_size > config.max_file_size:
+        if stat_result.st_size > config.max_file_size:
             raise HTTPException(
                 status_code=413, 
                 detail=f"File too large. Maximum size: {config.max_file_size // (1024*1024)}MB"
@@ -215,7 +307,8 @@ async def get_file_content(
             safe_path,
             page=page,
             lines_per_page=lines_per_page,
-            encoding=encoding
+            encoding=encoding,
+            stat_result=stat_result
         )
         
         return content_data
@@ -229,16 +322,22 @@ async def get_file_content(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.get("/api/file_info")
-async def get_file_info(path: str = Query(..., description="Relative file path")):
+@app.get("/api/file_info", response_class=ORJSONResponse)
+async def get_file_info(
+    path: str = Query(..., description="Relative file path"),
+    security_manager: SecurityManager = Depends(get_security_manager),
+    file_handler: FileHandler = Depends(get_file_handler)
+):
     """Get file metadata"""
     try:
         safe_path = security_manager.validate_path(path)
         
-        if not safe_path.exists():
+        try:
+            stat_result = file_handler._stat_existing(safe_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="File not found")
         
-        metadata = await file_handler.get_file_metadata(safe_path)
+        metadata = await file_handler.get_file_metadata(safe_path, stat_result=stat_result)
         return metadata
         
     except PermissionError:
@@ -246,84 +345,401 @@ async def get_file_info(path: str = Query(..., description="Relative file path")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.get("/api/search")
+def _walk_files(root: str, include_hidden: bool = False):
+    """Recursively yield file entries under root using os.scandir
+    
+    Directory entries carry their d_type, so no extra stat() is needed per
+    file. Symlinks are neither followed nor yielded. Directories in
+    _SEARCH_PRUNED_DIRS, and hidden directories unless include_hidden, are
+    not descended into.
+    """
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        name = entry.name
+                        if name in _SEARCH_PRUNED_DIRS or (
+                            not include_hidden and name.startswith('.')
+                        ):
+                            continue
+                        yield from _walk_files(entry.path, include_hidden)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+                except OSError:
+                    continue
+    except OSError:
+        return
+
+@lru_cache(maxsize=512)
+def _is_text_extension(extension: str) -> bool:
+    """Text-file classification for a lowercased extension, cached per extension"""
+    return get_file_handler()._is_text_file(Path("x" + extension))
+
+def _ascii_query_bytes(query_lower: str) -> Optional[bytes]:
+    """
+    Encode a lowercased search query for byte-level matching
+    
+    Returns None for non-ASCII queries: bytes.lower() only folds ASCII case,
+    so those queries are matched against decoded text instead.
+    """
+    query_bytes = query_lower.encode('utf-8')
+    if not query_bytes.isascii():
+        return None
+    return query_bytes
+
+def _find_ascii_match(content, query_bytes: bytes) -> int:
+    """
+    Case-insensitive offset of an ASCII query in content, or -1
+    
+    bytes.lower() plus find() runs several times faster than an IGNORECASE
+    regex, whose literal search can't use the fast substring scan. Content
+    is lowered a window at a time, so an mmap'd file is never copied whole;
+    windows overlap by len(query_bytes) - 1 to catch matches that span them.
+    """
+    length = len(content)
+    overlap = len(query_bytes) - 1
+    start = 0
+    while start < length:
+        window_end = start + _SEARCH_SCAN_WINDOW
+        index = content[start:window_end].lower().find(query_bytes)
+        if index >= 0:
+            return start + index
+        if window_end >= length:
+            break
+        start = window_end - overlap
+    return -1
+
+def _find_match_line(content, query_bytes: bytes) -> Optional[Tuple[int, str]]:
+    """
+    Find the first line of content matching query
+    
+    Args:
+        content: Raw file content as bytes or mmap
+        query_bytes: Lowercased ASCII query
+        
+    Returns:
+        Tuple of (1-based line number, decoded line) or None if no match
+    """
+    index = _find_ascii_match(content, query_bytes)
+    if index < 0:
+        return None
+    
+    line_start = content.rfind(b'\n', 0, index) + 1
+    line_end = content.find(b'\n', index)
+    if line_end < 0:
+        line_end = len(content)
+    
+    line = content[line_start:line_end].decode('utf-8', errors='ignore')
+    return _count_newlines(content, line_start) + 1, line
+
+def _count_newlines(content, end: int) -> int:
+    """
+    Count newlines in content[:end]
+    
+    mmap has no count(), and slicing up to end would copy nearly the whole
+    file for a late match, so count a _SEARCH_SCAN_WINDOW slice at a time.
+    """
+    count = 0
+    for start in range(0, end, _SEARCH_SCAN_WINDOW):
+        count += content[start:min(start + _SEARCH_SCAN_WINDOW, end)].count(b'\n')
+    return count
+
+def _find_match_line_text(content: bytes, query_lower: str) -> Optional[Tuple[int, str]]:
+    """Unicode-aware fallback of _find_match_line for non-ASCII queries"""
+    text = content.decode('utf-8', errors='ignore')
+    # One lower()/find() over the whole text instead of per line. Lowering
+    # can change string length but never adds or removes newlines, so line
+    # numbers still line up with the original text.
+    lowered = text.lower()
+    index = lowered.find(query_lower)
+    if index < 0:
+        return None
+    
+    line_number = lowered.count('\n', 0, index) + 1
+    return line_number, text.split('\n', line_number)[line_number - 1]
+
+class _SearchCandidate(NamedTuple):
+    """A walked file awaiting result collection"""
+    path: str
+    rel_path: str
+    score: float
+    match_type: Optional[str]
+    scan_content: bool
+    stamp: Optional[Tuple[int, int]]  # (mtime_ns, size) when indexing
+
+def _scan_file_content(
+    candidate: _SearchCandidate,
+    query_lower: str,
+    query_bytes: Optional[bytes]
+) -> Optional[Tuple[int, str]]:
+    """Find the first line of a file matching query, None if unreadable"""
+    # Taken before reading, so the index can tell whether a rewrite in the
+    # same mtime tick could have followed the read
+    read_ns = time.time_ns()
+    try:
+        with open(candidate.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if query_bytes is not None and size < len(query_bytes):
+                # Too short to hold the query; skip the read
+                return None
+            if query_bytes is None or size < _SEARCH_MMAP_THRESHOLD:
+                content = f.read()
+            else:
+                # Scan the page cache directly instead of copying the file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return _find_match_line(mapped, query_bytes)
+    except (OSError, ValueError):
+        return None
+    
+    if candidate.stamp is not None:
+        get_trigram_index().update(candidate.rel_path, *candidate.stamp, content, read_ns)
+    
+    if query_bytes is None:
+        return _find_match_line_text(content, query_lower)
+    return _find_match_line(content, query_bytes)
+
+def _start_content_scans(
+    pending: List[_SearchCandidate],
+    query_lower: str,
+    query_bytes: Optional[bytes]
+) -> Iterator[Optional[Tuple[int, str]]]:
+    """
+    Submit content scans for a batch of search candidates
+    
+    Executor.map submits every scan immediately, so the walk can carry on
+    while the batch is read; the returned iterator yields the outcome for
+    each candidate with scan_content set, in walk order.
+    """
+    to_scan = [candidate for candidate in pending if candidate.scan_content]
+    count = len(to_scan)
+    return iter(_search_executor.map(
+        _scan_file_content,
+        to_scan,
+        repeat(query_lower, count),
+        repeat(query_bytes, count)
+    ))
+
+def _collect_search_results(
+    pending: List[_SearchCandidate],
+    matches: Iterator[Optional[Tuple[int, str]]],
+    query_lower: str,
+    limit: int,
+    results: List[dict]
+):
+    """
+    Append a batch's matches to results in walk order
+    
+    Args:
+        pending: Candidates in walk order
+        matches: Iterator from _start_content_scans for the same batch
+        query_lower: Lowercased search query
+        limit: Maximum number of results
+        results: Result list to extend in place
+    """
+    for candidate in pending:
+        if len(results) >= limit:
+            return
+        
+        score = candidate.score
+        match_type = candidate.match_type
+        snippet = None
+        line_number = None
+        
+        match = next(matches) if candidate.scan_content else None
+        if match:
+            match_line_number, line = match
+            content_score = 0.6 if line.strip().lower() == query_lower else 0.4
+            if match_type:
+                # Content match adds context to a weaker filename match
+                score = max(score, content_score)
+            else:
+                score = content_score
+                match_type = "content"
+            snippet = line.strip()[:100]
+            line_number = match_line_number
+        
+        if match_type:
+            results.append({
+                "path": candidate.rel_path,
+                "type": "file",
+                "match_type": match_type,
+                "score": score,
+                "snippet": snippet,
+                "line_number": line_number
+            })
+
+def _search_files_sync(
+    query: str,
+    search_type: str,
+    search_path: Path,
+    extensions: str,
+    limit: int,
+    use_index: bool = True,
+    include_hidden: bool = False
+) -> List[dict]:
+    """
+    Blocking search implementation, run off the event loop
+    
+    Args:
+        query: Search query
+        search_type: filename, content or both
+        search_path: Validated directory to search
+        extensions: Comma-separated file extensions filter
+        limit: Maximum results
+        use_index: Skip files the trigram index rules out, and index files read
+        include_hidden: Also search inside hidden directories
+        
+    Returns:
+        List of result dictionaries in walk order
+    """
+    trigram_index = get_trigram_index()
+    results: List[dict] = []
+    pending: List[_SearchCandidate] = []
+    in_flight = None
+    # Walked paths come from the validated search path, so they all start
+    # with the security manager's resolved base prefix
+    base_prefix_len = len(get_security_manager().base_prefix)
+    query_lower = query.lower()
+    query_bytes = _ascii_query_bytes(query_lower)
+    
+    use_index = use_index and trigram_index.enabled and search_type in ["content", "both"]
+    # Bytes trigrams only rule files out for ASCII (case-folded) queries
+    candidates = (
+        trigram_index.candidates(query_bytes)
+        if use_index and query_bytes is not None
+        else None
+    )
+    
+    # Parse the extension filter once, accepting entries with or without
+    # the leading dot
+    ext_set = frozenset()
+    if extensions:
+        ext_names = [ext.strip().lower().lstrip('.') for ext in extensions.split(",")]
+        ext_set = frozenset(ext_names) | frozenset('.' + ext for ext in ext_names)
+    
+    # Filename-only queries never read files, so the name index can answer
+    # them without walking the tree
+    if search_type == "filename":
+        entries = get_filename_index().matches(str(search_path), query_lower, include_hidden)
+    else:
+        entries = _walk_files(str(search_path), include_hidden)
+    
+    for entry in entries:
+        rel_path = entry.path[base_prefix_len:]
+        filename = entry.name
+        
+        # Same semantics as Path.suffix, without building a Path
+        dot_index = filename.rfind('.')
+        file_ext = (
+            filename[dot_index:].lower()
+            if 0 < dot_index < len(filename) - 1
+            else ""
+        )
+        
+        # Filter by extensions if specified
+        if ext_set and file_ext not in ext_set:
+            continue
+        
+        score = 0.0
+        match_type = None
+        
+        # Filename search
+        filename_lower = filename.lower()
+        if search_type in ["filename", "both"] and query_lower in filename_lower:
+            if filename_lower == query_lower:
+                # Exact filename match gets perfect score
+                score = 1.0
+            elif filename_lower.startswith(query_lower):
+                # Filename starts with query gets high score
+                score = 0.9
+            else:
+                # Filename contains query gets good score
+                score = 0.7
+            match_type = "filename"
+        
+        # Content search for text files
+        # Extensionless dot files are configuration files and count as text
+        is_text = (
+            _is_text_extension(file_ext)
+            if file_ext or not filename.startswith('.')
+            else True
+        )
+        # A filename score of 0.8 or more cannot be changed by a content
+        # match, so skip reading the file entirely
+        scan_content = search_type in ["content", "both"] and is_text and score < 0.8
+        
+        stamp = None
+        if scan_content and use_index:
+            try:
+                stat = entry.stat(follow_symlinks=False)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass
+            
+            if (stamp is not None and query_bytes is not None
+                    and stamp[1] < len(query_bytes)):
+                # ASCII case folding keeps byte lengths, so a file with fewer
+                # bytes than the query cannot match; don't even open it
+                stamp = None
+                scan_content = False
+            elif (stamp is not None and candidates is not None
+                    and candidates.is_fresh(rel_path, *stamp)):
+                # Unchanged since indexed when the candidates were read:
+                # nothing to refresh, and a file lacking any query trigram
+                # cannot contain the query
+                stamp = None
+                if rel_path not in candidates.paths:
+                    scan_content = False
+            elif stamp is not None and trigram_index.is_fresh(rel_path, *stamp):
+                # Indexed since the candidates were read (e.g. by a concurrent
+                # search), so it cannot be ruled out, but needs no refresh
+                stamp = None
+        
+        if match_type or scan_content:
+            pending.append(_SearchCandidate(
+                entry.path, rel_path, score, match_type, scan_content, stamp
+            ))
+        
+        if len(pending) >= _SEARCH_BATCH_SIZE:
+            # Keep one batch in flight: its files are read while the walk
+            # gathers the next batch
+            batch = (pending, _start_content_scans(pending, query_lower, query_bytes))
+            if in_flight is not None:
+                _collect_search_results(*in_flight, query_lower, limit, results)
+            in_flight = batch
+            pending = []
+            if len(results) >= limit:
+                break
+    else:
+        if in_flight is not None:
+            _collect_search_results(*in_flight, query_lower, limit, results)
+        matches = _start_content_scans(pending, query_lower, query_bytes)
+        _collect_search_results(pending, matches, query_lower, limit, results)
+    
+    return results
+
+@app.get("/api/search", response_class=ORJSONResponse)
 async def search_files(
     q: str = Query(..., description="Search query"),
     type: str = Query("both", description="Search type: filename, content, both"),
     path: str = Query("", description="Limit search to specific directory"),
     extensions: str = Query("", description="Comma-separated file extensions"),
-    limit: int = Query(50, ge=1, le=200, description="Maximum results")
+    limit: int = Query(50, ge=1, le=200, description="Maximum results"),
+    use_index: bool = Query(True, description="Use the trigram index to skip non-matching files"),
+    include_hidden: bool = Query(False, description="Search inside hidden directories"),
+    security_manager: SecurityManager = Depends(get_security_manager)
 ):
     """Search files and content"""
     try:
-        # Simple search implementation for MVP
-        results = []
         search_path = security_manager.validate_path(path if path else "/")
         
-        # Get all files recursively
-        for file_path in search_path.rglob("*"):
-            if file_path.is_file():
-                rel_path = str(file_path.relative_to(config.base_path))
-                filename = file_path.name
-                
-                # Filter by extensions if specified
-                if extensions:
-                    ext_list = [ext.strip().lower() for ext in extensions.split(",")]
-                    file_ext = file_path.suffix.lower()
-                    if file_ext not in ext_list and file_ext.lstrip('.') not in ext_list:
-                        continue
-                
-                score = 0
-                match_type = None
-                snippet = None
-                line_number = None
-                
-                # Filename search
-                if type in ["filename", "both"] and q.lower() in filename.lower():
-                    filename_lower = filename.lower()
-                    query_lower = q.lower()
-                    
-                    if filename_lower == query_lower:
-                        # Exact filename match gets perfect score
-                        score = 1.0
-                    elif filename_lower.startswith(query_lower):
-                        # Filename starts with query gets high score
-                        score = 0.9
-                    else:
-                        # Filename contains query gets good score
-                        score = 0.7
-                    match_type = "filename"
-                
-                # Content search for text files
-                if type in ["content", "both"] and file_handler._is_text_file(file_path):
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            lines = f.readlines()
-                            for i, line in enumerate(lines):
-                                if q.lower() in line.lower():
-                                    # Only update if no filename match or content match is better
-                                    content_score = 0.6 if line.strip().lower() == q.lower() else 0.4
-                                    if not match_type or (match_type == "content" and content_score > score) or (match_type == "filename" and score < 0.8):
-                                        score = max(score, content_score) if match_type == "filename" else content_score
-                                        match_type = "content" if not match_type or match_type == "content" else match_type
-                                        snippet = line.strip()[:100]
-                                        line_number = i + 1
-                                    break
-                    except (UnicodeDecodeError, PermissionError):
-                        continue
-                
-                if match_type:
-                    results.append({
-                        "path": rel_path,
-                        "type": "file",
-                        "match_type": match_type,
-                        "score": score,
-                        "snippet": snippet,
-                        "line_number": line_number
-                    })
-                
-                if len(results) >= limit:
-                    break
+        # Walk and read files in a worker thread so the event loop stays free
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            None, _search_files_sync, q, type, search_path, extensions, limit,
+            use_index, include_hidden
+        )
         
         # Sort by score descending
         results.sort(key=lambda x: x["score"], reverse=True)
@@ -338,8 +754,8 @@ async def search_files(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/git/info")
-async def get_git_info():
+@app.get("/api/git/info", response_class=ORJSONResponse)
+async def get_git_info(git_integration: GitIntegration = Depends(get_git_integration)):
     """Get Git repository information"""
     try:
         repo_info = await git_integration.get_repository_info()
@@ -347,8 +763,12 @@ async def get_git_info():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/git/status/{file_path:path}")
-async def get_file_git_status(file_path: str):
+@app.get("/api/git/status/{file_path:path}", response_class=ORJSONResponse)
+async def get_file_git_status(
+    file_path: str,
+    security_manager: SecurityManager = Depends(get_security_manager),
+    git_integration: GitIntegration = Depends(get_git_integration)
+):
     """Get Git status for a specific file"""
     try:
         safe_path = security_manager.validate_path(file_path)
@@ -359,8 +779,13 @@ async def get_file_git_status(file_path: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/git/history/{file_path:path}")
-async def get_file_git_history(file_path: str, limit: int = 10):
+@app.get("/api/git/history/{file_path:path}", response_class=ORJSONResponse)
+async def get_file_git_history(
+    file_path: str,
+    limit: int = 10,
+    security_manager: SecurityManager = Depends(get_security_manager),
+    git_integration: GitIntegration = Depends(get_git_integration)
+):
     """Get Git commit history for a specific file"""
     try:
         safe_path = security_manager.validate_path(file_path)
@@ -371,8 +796,13 @@ async def get_file_git_history(file_path: str, limit: int = 10):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/git/diff/{file_path:path}")
-async def get_file_git_diff(file_path: str, commit: Optional[str] = None):
+@app.get("/api/git/diff/{file_path:path}", response_class=ORJSONResponse)
+async def get_file_git_diff(
+    file_path: str,
+    commit: Optional[str] = None,
+    security_manager: SecurityManager = Depends(get_security_manager),
+    git_integration: GitIntegration = Depends(get_git_integration)
+):
     """Get Git diff for a specific file"""
     try:
         safe_path = security_manager.validate_path(file_path)
@@ -383,8 +813,8 @@ async def get_file_git_diff(file_path: str, commit: Optional[str] = None):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/git/changes")
-async def get_git_changes():
+@app.get("/api/git/changes", response_class=ORJSONResponse)
+async def get_git_changes(git_integration: GitIntegration = Depends(get_git_integration)):
     """Get list of changed files in repository"""
     try:
         changes = await git_integration.get_changed_files()
@@ -393,18 +823,23 @@ async def get_git_changes():
         raise HTTPException(status_code=500, detail=str(e))
 
 # Terminal WebSocket connection manager
+_TERMINAL_READ_SIZE = 65536
+
 class TerminalManager:
     def __init__(self):
         self.active_connections = {}
         self.processes = {}
-        self.security = terminal_security
+        # Security manager each session was created with
+        self.security_sessions: Dict[str, TerminalSecurityManager] = {}
     
     async def connect(self, websocket: WebSocket, terminal_id: str):
         await websocket.accept()
         self.active_connections[terminal_id] = websocket
         
-        # Create security session
-        self.security.create_session(terminal_id, {
+        # Create security session; resolved per connection so that
+        # reset_components() applies to terminals opened afterwards
+        security = self.security_sessions[terminal_id] = get_terminal_security()
+        security.create_session(terminal_id, {
             'ip': websocket.client.host if websocket.client else 'unknown',
             'user_agent': websocket.headers.get('user-agent', 'unknown')
         })
@@ -417,25 +852,34 @@ class TerminalManager:
             stdout=slave,
             stderr=slave,
             preexec_fn=os.setsid,
-            cwd=str(config.base_path)
+            cwd=str(get_config().base_path)
         )
         
         os.close(slave)
-        self.processes[terminal_id] = {'master': master, 'proc': proc}
+        output = asyncio.Queue()
+        self.processes[terminal_id] = {'master': master, 'proc': proc, 'output': output}
         
-        # Start reading from terminal
-        asyncio.create_task(self.read_terminal(terminal_id))
+        # Read from the terminal whenever the event loop reports it readable;
+        # a single sender task forwards output in order
+        os.set_blocking(master, False)
+        asyncio.get_running_loop().add_reader(master, self._on_readable, terminal_id)
+        asyncio.create_task(self._send_output(terminal_id, websocket, output))
     
     async def disconnect(self, terminal_id: str):
         # End security session
-        self.security.end_session(terminal_id)
+        security = self.security_sessions.pop(terminal_id, None)
+        if security is not None:
+            security.end_session(terminal_id)
         
         if terminal_id in self.active_connections:
             del self.active_connections[terminal_id]
         
         if terminal_id in self.processes:
             proc_info = self.processes[terminal_id]
+            # Stop the sender task
+            proc_info['output'].put_nowait(None)
             try:
+                asyncio.get_running_loop().remove_reader(proc_info['master'])
                 os.close(proc_info['master'])
                 proc_info['proc'].terminate()
                 proc_info['proc'].wait(timeout=1)
@@ -446,13 +890,13 @@ class TerminalManager:
                     pass
             del self.processes[terminal_id]
     
-    async def send_to_terminal(self, terminal_id: str, data: str):
+    async def send_to_terminal(self, terminal_id: str, data: bytes):
         if terminal_id in self.processes:
             # Security validation for commands
-            if data.endswith('\r') or data.endswith('\n'):
+            if data.endswith((b'\r', b'\n')):
                 # This is a command being executed
-                command = data.rstrip('\r\n')
-                validation = self.security.validate_command(terminal_id, command)
+                command = data.rstrip(b'\r\n').decode('utf-8', errors='replace')
+                validation = self.security_sessions[terminal_id].validate_command(terminal_id, command)
                 
                 if not validation['allowed']:
                     # Send security warning to terminal
@@ -464,36 +908,66 @@ class TerminalManager:
                 
                 # Use sanitized command if available
                 if validation['sanitized_command'] != command:
-                    data = validation['sanitized_command'] + data[-1]  # Keep the line ending
+                    data = validation['sanitized_command'].encode('utf-8') + data[-1:]  # Keep the line ending
             
             master = self.processes[terminal_id]['master']
             try:
-                os.write(master, data.encode('utf-8'))
+                await self._write_input(master, data)
             except:
                 await self.disconnect(terminal_id)
     
-    async def read_terminal(self, terminal_id: str):
-        if terminal_id not in self.processes:
+    async def _write_input(self, master: int, data: bytes):
+        """Write to the non-blocking terminal, waiting while its buffer is full"""
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(master, view)
+            except BlockingIOError:
+                await asyncio.sleep(0.01)
+                continue
+            view = view[written:]
+    
+    def _on_readable(self, terminal_id: str):
+        """Queue pending terminal output; called by the event loop"""
+        proc_info = self.processes.get(terminal_id)
+        if proc_info is None:
             return
         
-        master = self.processes[terminal_id]['master']
-        websocket = self.active_connections.get(terminal_id)
+        # Drain what is available so bursts of output go out as one frame
+        chunks = []
+        eof = False
+        while True:
+            try:
+                data = os.read(proc_info['master'], _TERMINAL_READ_SIZE)
+            except BlockingIOError:
+                break
+            except OSError:
+                data = b''
+            
+            if not data:
+                eof = True
+                break
+            chunks.append(data)
+            if len(data) < _TERMINAL_READ_SIZE:
+                break
         
+        if chunks:
+            proc_info['output'].put_nowait(b''.join(chunks))
+        if eof:
+            # The shell exited
+            asyncio.get_running_loop().remove_reader(proc_info['master'])
+            proc_info['output'].put_nowait(None)
+    
+    async def _send_output(self, terminal_id: str, websocket: WebSocket, output: asyncio.Queue):
         try:
-            while terminal_id in self.processes and terminal_id in self.active_connections:
-                # Check if there's data to read
-                ready, _, _ = select.select([master], [], [], 0.1)
-                if ready:
-                    try:
-                        data = os.read(master, 1024)
-                        if data:
-                            await websocket.send_text(data.decode('utf-8', errors='ignore'))
-                        else:
-                            break
-                    except OSError:
-                        break
-                await asyncio.sleep(0.01)
-        except:
+            while True:
+                data = await output.get()
+                if data is None:
+                    break
+                # Raw bytes: the client decodes, including UTF-8 sequences
+                # split across reads
+                await websocket.send_bytes(data)
+        except Exception:
             pass
         finally:
             await self.disconnect(terminal_id)
@@ -506,12 +980,25 @@ async def websocket_terminal(websocket: WebSocket, terminal_id: str):
     await terminal_manager.connect(websocket, terminal_id)
     try:
         while True:
-            data = await websocket.receive_text()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            
+            # Binary frames are keystrokes and go straight to the terminal
+            data = message.get("bytes")
+            if data is not None:
+                await terminal_manager.send_to_terminal(terminal_id, data)
+                continue
             
-            # Handle terminal resize
-            if data.startswith('{"type":"resize"'):
+            # Text frames carry control messages such as resize
+            text = message.get("text") or ""
+            try:
+                msg = json.loads(text)
+            except ValueError:
+                msg = None
+            
+            if isinstance(msg, dict) and msg.get("type") == "resize":
                 try:
-                    msg = json.loads(data)
                     if terminal_id in terminal_manager.processes:
                         master = terminal_manager.processes[terminal_id]['master']
                         # Set terminal size
@@ -520,8 +1007,8 @@ async def websocket_terminal(websocket: WebSocket, terminal_id: str):
                 except:
                     pass
             else:
-                # Regular input
-                await terminal_manager.send_to_terminal(terminal_id, data)
+                # Input from clients that still send text frames
+                await terminal_manager.send_to_terminal(terminal_id, text.encode('utf-8'))
     except WebSocketDisconnect:
         await terminal_manager.disconnect(terminal_id)
     except Exception as e:
@@ -533,7 +1020,7 @@ async def veridoc_exception_handler(request, exc: VeriDocError):
     """Handle VeriDoc-specific exceptions"""
     status_code = error_handler.get_http_status_code(exc)
     response = error_handler.get_error_response(exc)
-    return JSONResponse(status_code=status_code, content=response)
+    return ORJSONResponse(status_code=status_code, content=response)
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -546,7 +1033,7 @@ async def global_exception_handler(request, exc):
     
     status_code = error_handler.get_http_status_code(veridoc_error)
     response = error_handler.get_error_response(veridoc_error)
-    return JSONResponse(status_code=status_code, content=response)
+    return ORJSONResponse(status_code=status_code, content=response)
 
 if __name__ == "__main__":
     import argparse
@@ -556,23 +1043,38 @@ if __name__ == "__main__":
     parser.add_argument("--host", default="localhost", help="Server host")
     parser.add_argument("--base-path", help="Base directory path")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker processes (default: 1; each worker maintains its own search index)"
+    )
     
     args = parser.parse_args()
     
     # Update config if base path provided
     if args.base_path:
-        config.base_path = Path(args.base_path).resolve()
-        security_manager = SecurityManager(config.base_path)
-        file_handler = FileHandler(security_manager)
-        git_integration = GitIntegration(config.base_path)
+        # Config reads the environment, which worker processes inherit
+        os.environ["VERIDOC_BASE_PATH"] = str(Path(args.base_path).resolve())
+        reset_components()
     
     print(f"🚀 VeriDoc server starting on http://{args.host}:{args.port}")
-    print(f"📁 Base path: {config.base_path}")
+    print(f"📁 Base path: {get_config().base_path}")
+    
+    # Prefer libuv's event loop and the C HTTP parser when installed
+    # (uvicorn[standard] ships both except uvloop on Windows)
+    from importlib.util import find_spec
+    
+    # Every worker runs the lifespan's background index maintenance, so
+    # more than one is opt-in
+    workers = 1 if args.debug else (args.workers or 1)
     
     uvicorn.run(
         "app:app",
         host=args.host,
         port=args.port,
         reload=args.debug,
+        workers=workers,
+        loop="uvloop" if find_spec("uvloop") else "auto",
+        http="httptools" if find_spec("httptools") else "auto",
         log_level="debug" if args.debug else "info"
     )
\ No newline at end of file